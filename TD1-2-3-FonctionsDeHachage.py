@@ -1,3 +1,9 @@
+try:
+    import numpy as np  # Optionnel : réduction XOR vectorisée sur les blocs de 32 bits
+except ImportError:
+    np = None  # Sans numpy, on retombe sur la boucle Python
+
+
 # Exercice1  : Fonction de compression  qui effectue un OU exclusif (XOR) bit à bit de deux expressions de 4 octets chacune
 
 def comp(a, b):
@@ -7,11 +13,55 @@ def comp(a, b):
     return (a ^ b) & 0xFFFFFFFF
 
 
+def comp_vec(a, b):
+    """
+    Version vectorisée de comp : XOR bit à bit, élément par élément, de deux tableaux
+    de mots de 4 octets (un seul appel pour tous les blocs au lieu d'un appel par bloc).
+    Nécessite numpy.
+    """
+    if np is None:
+        raise ImportError("comp_vec nécessite numpy (pip install numpy)")
+    # Le type uint32 garantit que chaque résultat reste sur 4 octets (pas besoin de masque)
+    return np.bitwise_xor(np.asarray(a, dtype=np.uint32), np.asarray(b, dtype=np.uint32))
+
+
 # EXERCICE 2 : Fonctions de hachage basées sur le schéma de Merkle-Damgård
 
 # Vecteur d'initialisation IV = 01111000 01100001 01110011 01101000
 IV = 0b01111000011000010111001101101000  # 0x78617368
 
+
+# En dessous de cette taille (en octets), le repli sur les grands entiers est plus rapide que numpy
+SEUIL_NUMPY = 512
+
+
+def _xor_fold(padded_message):
+    """
+    Applique la compression (XOR) à tous les blocs de 4 octets du message rembourré.
+    Comme comp est un simple XOR, h = IV ^ b0 ^ b1 ^ ... ^ b(k-1) : on peut donc
+    réduire tous les blocs d'un coup au lieu d'appeler comp bloc par bloc.
+    Le message doit avoir une longueur multiple de 4 octets (garanti par le rembourrage).
+    """
+    if np is not None and len(padded_message) >= SEUIL_NUMPY:
+        # Lecture des blocs comme entiers 32 bits big-endian, sans copie
+        blocs = np.frombuffer(padded_message, dtype=np.dtype('>u4'))
+        # XOR de tous les blocs par np.bitwise_xor.reduce (une seule boucle C), puis un seul appel à comp avec IV
+        return comp(IV, int(np.bitwise_xor.reduce(blocs)))
+
+    # Tout le message devient un seul grand entier (les blocs sont ses "chiffres" en base 2^32)
+    nb_blocs = len(padded_message) // 4
+    valeur = int.from_bytes(padded_message, byteorder='big')
+    # Repliement par moitiés : XOR de la moitié haute avec la moitié basse, jusqu'à un seul bloc.
+    # Chaque étape est un décalage/masque sur grand entier exécuté en C (O(log k) étapes Python).
+    while nb_blocs > 1:
+        if nb_blocs % 2:
+            nb_blocs += 1  # Un bloc nul en tête ne change ni la valeur ni le XOR
+        moitie = 32 * (nb_blocs // 2)
+        valeur = (valeur >> moitie) ^ (valeur & ((1 << moitie) - 1))
+        nb_blocs //= 2
+    return comp(IV, valeur)
+
+
 def XD(c):
     """
     Fonction de hachage XD(c) avec rembourrage par zéros.
@@ -25,22 +75,8 @@ def XD(c):
     padding_length = (4 - (message_length % 4)) % 4  # Nombre de zéros à ajouter
     padded_message = message_bytes + b'\x00' * padding_length
     
-    # Initialiser avec IV
-    h = IV
-    
-    # Traiter le message par blocs de 4 octets
-    for i in range(0, len(padded_message), 4):
-        # Extraire un bloc de 4 octets
-        bloc = padded_message[i:i+4]
-        # Compléter avec des zéros si le dernier bloc est incomplet
-        while len(bloc) < 4:
-            bloc += b'\x00'
-        # Convertir le bloc en entier de 32 bits
-        bloc_int = int.from_bytes(bloc, byteorder='big')
-        # Appliquer la fonction de compression
-        h = comp(h, bloc_int)
-    
-    return h
+    # Traiter le message par blocs de 4 octets (à partir de IV)
+    return _xor_fold(padded_message)
 
 
 def XDD(c):
@@ -51,27 +87,15 @@ def XDD(c):
     # Convertir la chaîne en bytes
     message_bytes = c.encode('utf-8')
     
-    # Rembourrage par 100...0 : ajouter un bit 1 puis des zéros
-    # On ajoute d'abord 0x80 (10000000 en binaire)
-    message_bytes += b'\x80'
-    
-    # Ajouter des zéros jusqu'à ce que la longueur soit un multiple de 4 octets
-    message_length = len(message_bytes)
+    # Rembourrage par 100...0 : un bit 1 (0x80 = 10000000 en binaire) puis des zéros
+    # jusqu'à ce que la longueur soit un multiple de 4 octets
+    message_length = len(message_bytes) + 1  # + 1 pour l'octet 0x80
     padding_length = (4 - (message_length % 4)) % 4
-    padded_message = message_bytes + b'\x00' * padding_length
-    
-    # Initialiser avec IV
-    h = IV
-    
-    # Traiter le message par blocs de 4 octets
-    for i in range(0, len(padded_message), 4):
-        bloc = padded_message[i:i+4]
-        while len(bloc) < 4:
-            bloc += b'\x00'
-        bloc_int = int.from_bytes(bloc, byteorder='big')
-        h = comp(h, bloc_int)
+    # Message rembourré construit en une seule allocation (pas de copies successives)
+    padded_message = b''.join((message_bytes, b'\x80', b'\x00' * padding_length))
     
-    return h
+    # Traiter le message par blocs de 4 octets (à partir de IV)
+    return _xor_fold(padded_message)
 
 
 def XDDD(c):
@@ -83,32 +107,21 @@ def XDDD(c):
     message_bytes = c.encode('utf-8')
     original_length = len(message_bytes)  # Longueur originale en octets
     
-    # Rembourrage par 100...0 : ajouter 0x80 (bit 1 suivi de zéros)
-    message_bytes += b'\x80'
-    
+    # Rembourrage par 100...0 : 0x80 (bit 1 suivi de zéros)
     # Calculer la longueur totale nécessaire pour avoir un multiple de 4 octets
     # On doit laisser de la place pour les 4 octets de longueur à la fin
-    current_length = len(message_bytes)
+    current_length = original_length + 1  # + 1 pour l'octet 0x80
     # Ajouter des zéros jusqu'à ce qu'il reste exactement 4 octets pour la longueur
     padding_length = (4 - ((current_length + 4) % 4)) % 4
-    padded_message = message_bytes + b'\x00' * padding_length
     
-    # Ajouter la longueur du message original (en octets) sur 4 octets
+    # Longueur du message original (en octets) sur 4 octets
     length_bytes = original_length.to_bytes(4, byteorder='big')
-    padded_message += length_bytes
-    
-    # Initialiser avec IV
-    h = IV
     
-    # Traiter le message par blocs de 4 octets
-    for i in range(0, len(padded_message), 4):
-        bloc = padded_message[i:i+4]
-        while len(bloc) < 4:
-            bloc += b'\x00'
-        bloc_int = int.from_bytes(bloc, byteorder='big')
-        h = comp(h, bloc_int)
+    # Message rembourré construit en une seule allocation (pas de copies successives)
+    padded_message = b''.join((message_bytes, b'\x80', b'\x00' * padding_length, length_bytes))
     
-    return h
+    # Traiter le message par blocs de 4 octets (à partir de IV)
+    return _xor_fold(padded_message)
 
 
 # Exemple d'utilisation
@@ -122,7 +135,11 @@ if __name__ == "__main__":
     print(f"a = 0x{a:08X}")
     print(f"b = 0x{b:08X}")
     print(f"comp(a, b) = 0x{resultat:08X}")
-    print(f"comp(a, b) = {resultat}\n")
+    print(f"comp(a, b) = {resultat}")
+    if np is not None:
+        # comp_vec applique comp à plusieurs paires de blocs en un seul appel
+        print(f"comp_vec([a, b], [b, a]) = {[f'0x{x:08X}' for x in comp_vec([a, b], [b, a])]}")
+    print()
     
     # Test EXERCICE 2 : Fonctions de hachage
     print("=== EXERCICE 2 : Fonctions de hachage ===")
@@ -1,18 +1,32 @@
 # Import des modules standards Python pour la manipulation de données
-import json  # Module pour lire/écrire des fichiers JSON
+import orjson  # Module pour lire/écrire du JSON (implémenté en C/Rust, bien plus rapide que le module json standard)
 import hashlib  # Module pour calculer les hashs cryptographiques (SHA-256)
+import ssl  # Version d'OpenSSL utilisée par hashlib (accélération matérielle de SHA-256)
 import base64  # Module pour encoder/décoder en base64 (pour les signatures)
-from datetime import datetime, timezone  # Module pour gérer les timestamps ISO8601
+import bisect  # Recherche dichotomique (insertion d'une transaction à sa place chronologique)
+import os  # Module pour les positions dans les fichiers (SEEK_END) et les infos fichier (fstat)
+import threading  # Verrou entre les threads d'un même processus serveur (caches en mémoire)
+from contextlib import contextmanager  # Décorateur pour créer des blocs "with" (verrou sur le fichier)
+import multiprocessing  # Contexte de démarrage des processus du pool de calcul des hashs
+from concurrent.futures import ThreadPoolExecutor  # Pool de threads pour vérifier plusieurs signatures en parallèle
+from concurrent.futures import ProcessPoolExecutor  # Pool de processus pour recalculer beaucoup de hashs en parallèle
+import time  # Module pour l'heure système (timestamps ISO8601 en UTC)
+import logging  # Niveau du journal de l'application (rapport SHA-256 au démarrage)
 from pathlib import Path  # Module pour manipuler les chemins de fichiers de manière portable
 from typing import List, Dict, Any, Optional  # Module pour les annotations de type (aide au développement)
 
 # Import des modules Flask pour créer l'API HTTP
-from flask import Flask, request, jsonify  # Flask: framework web, request: données HTTP entrantes, jsonify: réponse JSON
+from flask import Flask, request  # Flask: framework web, request: données HTTP entrantes
 
 # Import des modules de cryptographie pour les signatures RSA (v4)
 from cryptography.hazmat.primitives import hashes, serialization  # hashes: SHA-256, serialization: format PEM
 from cryptography.hazmat.primitives.asymmetric import rsa, padding  # rsa: algorithme RSA, padding: PSS pour signatures
-from cryptography.hazmat.backends import default_backend  # Backend cryptographique par défaut
+from cryptography.hazmat.primitives.asymmetric import ed25519  # ed25519: signatures Ed25519 (plus rapides, 64 octets)
+
+try:
+    import fcntl  # Verrou de fichier POSIX (plusieurs processus serveur écrivant dans tx.json)
+except ImportError:  # Non disponible sous Windows : pas de verrou entre processus
+    fcntl = None
 
 
 # ===== CONFIGURATION DES CHEMINS DE STOCKAGE =====
@@ -33,44 +47,271 @@ def ensure_storage():
         KEYS_FILE.write_text("{}", encoding="utf-8")  # Crée un fichier vide avec un objet JSON vide (aucune clé)
 
 
+# ===== CACHES EN MÉMOIRE =====
+# Les fichiers JSON ne sont relus et re-décodés que s'ils ont changé sur disque depuis la dernière lecture.
+# "stamp" = empreinte du fichier (date de modification en ns, taille) au moment de la lecture.
+# _cache_lock protège les caches quand le serveur traite plusieurs requêtes en parallèle (threads) :
+# un rechargement du fichier ne peut pas se mêler à l'ajout d'une transaction en cours.
+_cache_lock = threading.RLock()  # Réentrant : append_transaction appelle load_transactions sous le verrou
+_tx_cache = {
+    "stamp": None,  # Empreinte du fichier de transactions lu
+    "data": None,  # Transactions décodées (liste)
+    "totals": {},  # Index des soldes : {personne: [total reçu, total envoyé]}
+    "by_person": {},  # Index par personne : {personne: [transactions où elle est p1 ou p2]}
+    "last_tx": None,  # Transaction la plus récente (timestamp le plus grand), pour le hash chaîné
+    "ordered": True,  # True si la liste est déjà dans l'ordre chronologique (aucun tri nécessaire)
+    "unordered_persons": set(),  # Personnes dont la liste de "by_person" n'est pas dans l'ordre chronologique
+    # Vue chronologique des transactions (et leurs timestamps), utilisée seulement si "ordered" est faux :
+    # construite à la première demande, puis chaque transaction y est insérée à sa place (bisect)
+    "chrono": None,
+    "chrono_keys": None,
+    "merkle": None,  # Arbre de Merkle sur les hashs (niveaux de nœuds), construit à la première demande
+}
+_keys_cache = {
+    "stamp": None,  # Empreinte du fichier de clés lu
+    "data": None,  # Clés publiques décodées (dictionnaire {personne: PEM})
+    "objects": {},  # Clés publiques déjà chargées depuis le PEM : {personne: objet clé}
+    # Signatures déjà vérifiées valides avec les clés actuelles : empreintes (personne, SHA-256 du message
+    # et de la signature). Ensemble exact (pas de faux positif, contrairement à un filtre de Bloom) ;
+    # remplacé par un ensemble vide (pas vidé sur place) dès qu'une clé change
+    "verified": set(),
+}
+
+# Nombre minimal de signatures à vérifier dans /verify pour utiliser un pool de threads
+# (en dessous, créer les threads coûte plus cher que les vérifications elles-mêmes)
+SIGNATURE_POOL_MIN = 64
+
+# Nombre minimal de hashs à recalculer dans /verify pour utiliser un pool de processus
+# (SHA-256 sur de petits messages garde le GIL : des threads n'aideraient pas ; envoyer les
+# messages aux processus a un coût fixe, rentable seulement sur un grand registre)
+HASH_POOL_MIN = 20000
+_hash_pool = None  # Pool de processus, créé à la première utilisation puis réutilisé
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """
+    Remplace le contenu d'un fichier de manière atomique : écriture dans un fichier temporaire,
+    fsync, puis os.replace (renommage atomique). Un arrêt brutal pendant l'écriture laisse
+    l'ancien fichier intact au lieu d'un JSON tronqué impossible à relire.
+    Paramètres:
+        path: Fichier à remplacer
+        data: Nouveau contenu
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")  # Nom propre au processus (pas de collision)
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())  # Contenu sur disque avant le renommage
+    os.replace(tmp, path)
+
+
+def _file_stamp(path: Path) -> tuple:
+    """
+    Calcule l'empreinte d'un fichier pour savoir s'il a été modifié (par l'API ou par un script externe).
+    Paramètre: path - Chemin du fichier
+    Retourne: Tuple (date de modification en nanosecondes, taille en octets)
+    """
+    st = path.stat()  # Un seul appel système, bien moins coûteux que relire et décoder le JSON
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _index_transaction(tx: Dict[str, Any]) -> None:
+    """
+    Met à jour les index en mémoire avec une transaction (en O(1)) :
+    totaux reçus/envoyés par personne, transactions par personne et transaction la plus récente.
+    Paramètre: tx - Transaction à prendre en compte
+    """
+    a = tx.get("a", 0)
+    if isinstance(a, (int, float)):  # Un montant invalide (fichier modifié à la main) est ignoré dans les soldes
+        totals = _tx_cache["totals"]
+        if "p2" in tx:
+            totals.setdefault(tx["p2"], [0, 0])[0] += a  # Entrée pour le destinataire
+        if "p1" in tx:
+            totals.setdefault(tx["p1"], [0, 0])[1] += a  # Sortie pour l'expéditeur
+    
+    by_person = _tx_cache["by_person"]
+    t = tx.get("t", "")
+    for person in {tx.get("p1"), tx.get("p2")} - {None}:  # Un ensemble : une seule fois si p1 == p2
+        person_txs = by_person.setdefault(person, [])
+        if person_txs and t < person_txs[-1].get("t", ""):
+            _tx_cache["unordered_persons"].add(person)  # Liste à trier avant de la renvoyer
+        person_txs.append(tx)
+    
+    # Même règle que le tri chronologique : en cas d'égalité de timestamp, la dernière de la liste gagne
+    last_tx = _tx_cache["last_tx"]
+    if last_tx is None or tx.get("t", "") >= last_tx.get("t", ""):
+        _tx_cache["last_tx"] = tx
+    else:
+        # Timestamp plus ancien que la dernière transaction (timestamp fourni par le client
+        # ou fichier modifié à la main) : la liste n'est plus dans l'ordre chronologique
+        _tx_cache["ordered"] = False
+    
+    # Vue chronologique déjà construite : insertion à sa place, après les timestamps égaux (comme un tri stable)
+    chrono = _tx_cache["chrono"]
+    if chrono is not None:
+        position = bisect.bisect_right(_tx_cache["chrono_keys"], t)
+        _tx_cache["chrono_keys"].insert(position, t)
+        chrono.insert(position, tx)
+    
+    # Arbre de Merkle déjà construit : ajoute la feuille et met à jour ses ancêtres en O(log N)
+    if _tx_cache["merkle"] is not None:
+        _merkle_append(_tx_cache["merkle"], _merkle_leaf(tx.get("h", "")))
+
+
+def _rebuild_indexes(txs: List[Dict[str, Any]]) -> None:
+    """
+    Reconstruit tous les index en mémoire à partir de la liste complète des transactions.
+    Appelée uniquement quand le fichier a été relu ou entièrement réécrit.
+    Paramètre: txs - Liste de toutes les transactions
+    """
+    _tx_cache["totals"] = {}
+    _tx_cache["by_person"] = {}
+    _tx_cache["last_tx"] = None
+    _tx_cache["ordered"] = True
+    _tx_cache["unordered_persons"] = set()
+    _tx_cache["chrono"] = None  # Reconstruite seulement si la liste n'est pas dans l'ordre chronologique
+    _tx_cache["chrono_keys"] = None
+    _tx_cache["merkle"] = None  # Reconstruit seulement si un endpoint /merkle est appelé
+    for tx in txs:
+        _index_transaction(tx)
+
+
 def load_transactions() -> List[Dict[str, Any]]:
     """
     Charge toutes les transactions depuis le fichier JSON.
+    Le fichier n'est relu que s'il a changé depuis la dernière lecture (sinon la liste en cache est retournée).
     Retourne: Liste de dictionnaires représentant les transactions.
     """
     ensure_storage()  # S'assure que le fichier existe avant de le lire
-    return json.loads(TX_FILE.read_text(encoding="utf-8"))  # Lit le fichier, décode UTF-8, parse le JSON en liste Python
+    with _cache_lock:
+        stamp = _file_stamp(TX_FILE)  # Empreinte actuelle du fichier
+        if stamp != _tx_cache["stamp"]:  # Fichier modifié (ou premier appel) : il faut le relire
+            # Lit le fichier en bytes et parse le JSON en liste Python (orjson décode l'UTF-8 lui-même)
+            _tx_cache["data"] = orjson.loads(TX_FILE.read_bytes())
+            _tx_cache["stamp"] = stamp
+            _rebuild_indexes(_tx_cache["data"])  # Les index doivent correspondre au nouveau contenu
+        return _tx_cache["data"]
 
 
 def save_transactions(txs: List[Dict[str, Any]]) -> None:
     """
-    Sauvegarde toutes les transactions dans le fichier JSON.
+    Sauvegarde toutes les transactions dans le fichier JSON et met à jour le cache.
     Paramètre: txs - Liste de dictionnaires représentant les transactions à sauvegarder.
     """
-    # Convertit la liste Python en JSON formaté (indent=2 pour lisibilité, ensure_ascii=False pour UTF-8)
-    TX_FILE.write_text(json.dumps(txs, indent=2, ensure_ascii=False), encoding="utf-8")
+    with _cache_lock:
+        # Convertit la liste Python en JSON formaté (indentation de 2 pour lisibilité, UTF-8 sans échappement)
+        _atomic_write_bytes(TX_FILE, orjson.dumps(txs, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        # Le cache reflète ce qu'on vient d'écrire : pas besoin de relire le fichier à la prochaine requête
+        _tx_cache["data"] = txs
+        _tx_cache["stamp"] = _file_stamp(TX_FILE)
+        _rebuild_indexes(txs)
+
+
+@contextmanager
+def locked_tx_file():
+    """
+    Ouvre le fichier de transactions en lecture/écriture avec un verrou exclusif.
+    Le verrou est gardé pendant toute la durée du bloc "with" : lire la dernière transaction,
+    calculer le hash chaîné et écrire la nouvelle transaction se font sans qu'un autre
+    processus ne puisse ajouter une transaction entre-temps.
+    Retourne (via yield): Fichier ouvert en mode binaire lecture/écriture
+    """
+    ensure_storage()  # S'assure que le fichier existe avant de l'ouvrir
+    while True:
+        f = open(TX_FILE, "r+b")  # "r+b" = lecture/écriture binaire sans tronquer le fichier
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)  # Verrou exclusif, libéré automatiquement à la fermeture
+        # Pendant l'attente du verrou, le fichier a pu être remplacé (save_transactions, os.replace) :
+        # le verrou porte alors sur l'ancien fichier, il faut rouvrir le nouveau
+        try:
+            replaced = os.fstat(f.fileno()).st_ino != os.stat(TX_FILE).st_ino
+        except FileNotFoundError:
+            replaced = True
+        if not replaced:
+            break
+        f.close()
+        ensure_storage()
+    with f:
+        yield f
+
+
+def append_transaction(f, tx: Dict[str, Any]) -> None:
+    """
+    Ajoute une transaction à la fin du fichier JSON sans réécrire les transactions précédentes.
+    Le fichier reste un tableau JSON identique à celui produit par save_transactions :
+    on écrase seulement le "]" final par ",\n  {nouvelle transaction}\n]".
+    Écriture en O(1) au lieu de réécrire tout le fichier (O(N)) à chaque transaction.
+    Paramètres:
+        f: Fichier ouvert par locked_tx_file() (verrou déjà pris)
+        tx: Transaction à ajouter
+    """
+    # Sérialise d'abord la transaction : si elle n'est pas sérialisable, rien n'est modifié
+    # Indentation de 2 supplémentaire pour correspondre à la mise en forme du tableau
+    block = orjson.dumps(tx, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).replace(b"\n", b"\n  ")
+    # Verrou des caches : aucune requête ne doit relire le fichier entre l'écriture et la mise à jour du cache
+    with _cache_lock:
+        txs = load_transactions()  # Transactions actuelles (à jour, le verrou est pris)
+        
+        # Lit la fin du fichier pour trouver le "]" final et savoir si le tableau est vide
+        size = f.seek(0, os.SEEK_END)
+        start = max(0, size - 4096)
+        f.seek(start)
+        tail = f.read().rstrip()  # Ignore les espaces/retours à la ligne en fin de fichier
+        before = tail[:-1].rstrip()  # Contenu juste avant le "]"
+        if not tail.endswith(b"]") or not before:
+            # Fin de fichier inattendue (modifiée à la main) : on réécrit tout le fichier
+            save_transactions(txs + [tx])
+            return
+        
+        empty = before.endswith(b"[")  # "[]" : première transaction, pas de virgule
+        f.seek(start + len(before))  # Position juste après le dernier élément (ou après "[")
+        f.write((b"\n  " if empty else b",\n  ") + block + b"\n]")
+        f.truncate()  # Supprime d'éventuels espaces qui suivaient l'ancien "]"
+        f.flush()
+        
+        # Met à jour le cache et les index avec la transaction écrite, sans relire le fichier
+        txs.append(tx)
+        _index_transaction(tx)
+        st = os.fstat(f.fileno())
+        _tx_cache["stamp"] = (st.st_mtime_ns, st.st_size)
 
 
 def load_public_keys() -> Dict[str, str]:
     """
     Charge toutes les clés publiques depuis le fichier JSON.
+    Le fichier n'est relu que s'il a changé depuis la dernière lecture (sinon le dictionnaire en cache est retourné).
     Retourne: Dictionnaire {nom_personne: clé_publique_pem}
     """
     ensure_storage()  # S'assure que le fichier existe
-    return json.loads(KEYS_FILE.read_text(encoding="utf-8"))  # Parse le JSON en dictionnaire Python
+    with _cache_lock:
+        stamp = _file_stamp(KEYS_FILE)  # Empreinte actuelle du fichier
+        if stamp != _keys_cache["stamp"]:  # Fichier modifié (ou premier appel) : il faut le relire
+            _keys_cache["data"] = orjson.loads(KEYS_FILE.read_bytes())  # Parse le JSON en dictionnaire Python
+            _keys_cache["stamp"] = stamp
+            _keys_cache["objects"] = {}  # Les clés ont pu changer : les objets clés déjà chargés sont invalides
+            _keys_cache["verified"] = set()  # ... ainsi que les signatures vérifiées avec ces clés
+        return _keys_cache["data"]
 
 
-def save_public_key(person: str, public_key_pem: str) -> None:
+def save_public_key(person: str, public_key_pem: str, public_key=None) -> None:
     """
-    Enregistre une clé publique pour une personne dans le fichier JSON.
+    Enregistre une clé publique pour une personne dans le fichier JSON et met à jour le cache.
     Paramètres:
         person: Nom de la personne (clé du dictionnaire)
         public_key_pem: Clé publique au format PEM (chaîne de caractères)
+        public_key: Objet clé déjà chargé depuis ce PEM (optionnel) : gardé en cache pour éviter de réanalyser le PEM
     """
-    keys = load_public_keys()  # Charge toutes les clés existantes
-    keys[person] = public_key_pem  # Ajoute ou remplace la clé publique de cette personne
-    # Sauvegarde le dictionnaire mis à jour dans le fichier JSON
-    KEYS_FILE.write_text(json.dumps(keys, indent=2, ensure_ascii=False), encoding="utf-8")
+    with _cache_lock:  # Deux enregistrements simultanés ne doivent pas s'écraser
+        keys = load_public_keys()  # Charge toutes les clés existantes
+        keys[person] = public_key_pem  # Ajoute ou remplace la clé publique de cette personne
+        # Sauvegarde le dictionnaire mis à jour dans le fichier JSON
+        _atomic_write_bytes(KEYS_FILE, orjson.dumps(keys, option=orjson.OPT_INDENT_2))
+        _keys_cache["stamp"] = _file_stamp(KEYS_FILE)  # Le dictionnaire en cache est déjà à jour
+        _keys_cache["verified"] = set()  # Signatures vérifiées avec l'ancienne clé de cette personne : à revérifier
+        if public_key is not None:
+            _keys_cache["objects"][person] = public_key  # Clé déjà validée : prête pour les vérifications
+        else:
+            _keys_cache["objects"].pop(person, None)  # L'ancienne clé chargée de cette personne n'est plus valable
 
 
 def get_public_key(person: str) -> Optional[str]:
@@ -83,32 +324,64 @@ def get_public_key(person: str) -> Optional[str]:
     return keys.get(person)  # Retourne la clé de la personne, ou None si absente
 
 
-def verify_signature(public_key_pem: str, message: str, signature_b64: str) -> bool:
+def get_public_key_object(person: str):
+    """
+    Récupère la clé publique d'une personne sous forme d'objet utilisable pour vérifier des signatures.
+    Le PEM n'est analysé qu'une seule fois par personne : l'objet clé est ensuite gardé en cache.
+    Paramètre: person - Nom de la personne
+    Retourne: Objet clé publique, ou None si la clé est absente ou invalide
+    """
+    public_key_pem = get_public_key(person)  # Met aussi à jour le cache si le fichier de clés a changé
+    if not public_key_pem:
+        return None
+    objects = _keys_cache["objects"]
+    if person not in objects:
+        try:
+            # Charge la clé publique depuis le format PEM (chaîne) vers un objet Python utilisable
+            objects[person] = serialization.load_pem_public_key(
+                public_key_pem.encode('utf-8'),  # Convertit la chaîne PEM en bytes
+            )  # Plus d'argument backend : cryptography >= 3.1 utilise toujours le backend OpenSSL
+        except Exception:  # PEM invalide (fichier de clés modifié à la main)
+            objects[person] = None
+    return objects[person]
+
+
+# Types de clés publiques acceptés : RSA (signature RSA-PSS/SHA-256) et Ed25519
+SUPPORTED_KEY_TYPES = (rsa.RSAPublicKey, ed25519.Ed25519PublicKey)
+
+# Paramètres RSA-PSS (SHA-256, sel de longueur maximale), créés une seule fois et réutilisés à chaque vérification
+PSS_HASH = hashes.SHA256()  # Algorithme de hachage SHA-256
+PSS_PADDING = padding.PSS(  # Padding PSS (Probabilistic Signature Scheme) pour RSA
+    mgf=padding.MGF1(PSS_HASH),  # Fonction de génération de masque utilisant SHA-256
+    salt_length=padding.PSS.MAX_LENGTH  # Longueur maximale du sel pour sécurité maximale
+)
+
+
+def verify_signature(public_key, message: bytes, signature_b64: str) -> bool:
     """
-    Vérifie une signature RSA pour s'assurer qu'elle correspond au message et à la clé publique.
+    Vérifie une signature (RSA-PSS ou Ed25519) pour s'assurer qu'elle correspond au message et à la clé publique.
+    L'algorithme est déterminé par le type de la clé publique enregistrée pour l'expéditeur.
     Paramètres:
-        public_key_pem: Clé publique au format PEM (chaîne de caractères)
-        message: Message original qui a été signé (chaîne de caractères)
+        public_key: Objet clé publique (voir get_public_key_object), None si absente ou invalide
+        message: Message original qui a été signé, déjà encodé en UTF-8 (voir signing_bytes)
         signature_b64: Signature encodée en base64 (chaîne de caractères)
     Retourne: True si la signature est valide, False sinon
     """
+    if public_key is None:  # Pas de clé utilisable : la signature ne peut pas être valide
+        return False
     try:
-        # Charge la clé publique depuis le format PEM (chaîne) vers un objet Python utilisable
-        public_key = serialization.load_pem_public_key(
-            public_key_pem.encode('utf-8'),  # Convertit la chaîne PEM en bytes
-            backend=default_backend()  # Utilise le backend cryptographique par défaut
-        )
-        # Décode la signature base64 en bytes binaires (la signature RSA est binaire)
+        # Décode la signature base64 en bytes binaires (la signature est binaire)
         signature = base64.b64decode(signature_b64)
-        # Vérifie la signature: si elle correspond au message avec cette clé publique, pas d'exception
+        if isinstance(public_key, ed25519.Ed25519PublicKey):
+            # Ed25519 : ni padding ni fonction de hachage à préciser (SHA-512 intégré à l'algorithme)
+            public_key.verify(signature, message)
+            return True
+        # Vérifie la signature RSA: si elle correspond au message avec cette clé publique, pas d'exception
         public_key.verify(
             signature,  # Signature binaire à vérifier
-            message.encode('utf-8'),  # Message original converti en bytes
-            padding.PSS(  # Padding PSS (Probabilistic Signature Scheme) pour RSA
-                mgf=padding.MGF1(hashes.SHA256()),  # Fonction de génération de masque utilisant SHA-256
-                salt_length=padding.PSS.MAX_LENGTH  # Longueur maximale du sel pour sécurité maximale
-            ),
-            hashes.SHA256()  # Algorithme de hachage utilisé (SHA-256)
+            message,  # Message original (bytes)
+            PSS_PADDING,  # Padding PSS avec MGF1/SHA-256 (voir PSS_PADDING)
+            PSS_HASH  # Algorithme de hachage utilisé (SHA-256)
         )
         return True  # Si aucune exception n'est levée, la signature est valide
     except Exception:
@@ -130,13 +403,47 @@ def get_transaction_data_for_signing(p1: str, p2: str, t: str, a: float) -> str:
     return f"{p1}|{p2}|{t}|{a}"  # Concaténation avec séparateur "|" pour éviter les ambiguïtés
 
 
+def signing_bytes(tx: Dict[str, Any]) -> Optional[bytes]:
+    """
+    Encode une seule fois le message "P1|P2|timestamp|montant" d'une transaction.
+    Les mêmes bytes servent à la fois à vérifier la signature et à calculer le hash chaîné
+    (voir compute_hash_from_message) : la chaîne n'est ni reformatée ni ré-encodée deux fois.
+    Paramètre: tx - Transaction (dictionnaire)
+    Retourne: Message encodé en UTF-8, ou None s'il manque un des champs p1, p2, t, a
+    """
+    try:
+        return get_transaction_data_for_signing(tx["p1"], tx["p2"], tx["t"], tx["a"]).encode("utf-8")
+    except KeyError:  # Champ manquant (fichier modifié à la main)
+        return None
+
+
+# Dernier timestamp généré par now_iso : (microsecondes depuis l'époque, secondes, "AAAA-MM-JJTHH:MM:SS")
+_now_iso_cache = (0, None, "")
+_now_iso_lock = threading.Lock()  # Lecture + mise à jour de _now_iso_cache en une seule étape entre threads
+
+
 def now_iso() -> str:
     """
-    Génère un timestamp au format ISO8601 (UTC).
+    Génère un timestamp au format ISO8601 (UTC), toujours avec les microsecondes.
     Exemple: "2026-01-20T10:30:45.123456+00:00"
+    La partie date/heure n'est reformatée qu'une fois par seconde ; seules les microsecondes
+    changent entre deux appels (pas d'objet datetime créé à chaque transaction).
+    Les timestamps sont strictement croissants dans un processus : deux appels dans la même
+    microseconde (rafale de requêtes) ou une horloge qui recule (NTP) donnent +1 µs au lieu d'un doublon.
     Retourne: Chaîne de caractères représentant la date/heure actuelle en UTC
     """
-    return datetime.now(timezone.utc).isoformat()  # UTC pour éviter les problèmes de fuseaux horaires
+    global _now_iso_cache
+    # Verrou propre à now_iso : deux threads ne peuvent pas lire le même dernier timestamp,
+    # ni remettre le cache à une valeur plus ancienne (quel que soit l'appelant)
+    with _now_iso_lock:
+        last_micros, cached_seconds, prefix = _now_iso_cache
+        micros = max(time.time_ns() // 1000, last_micros + 1)
+        seconds, micro_part = divmod(micros, 1_000_000)
+        if seconds != cached_seconds:
+            # UTC pour éviter les problèmes de fuseaux horaires
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _now_iso_cache = (micros, seconds, prefix)
+    return f"{prefix}.{micro_part:06d}+00:00"
 
 
 def compute_hash(p1: str, p2: str, t: str, a: float, prev_hash: str = "0") -> str:
@@ -158,10 +465,318 @@ def compute_hash(p1: str, p2: str, t: str, a: float, prev_hash: str = "0") -> st
     return hashlib.sha256(data.encode("utf-8")).hexdigest()
 
 
+def compute_hash_from_message(message: bytes, prev_hash: str = "0") -> str:
+    """
+    Calcule le même hash chaîné que compute_hash, à partir du message déjà encodé (voir signing_bytes).
+    SHA-256("P1|P2|t|a" + "|" + prev_hash) : résultat identique à compute_hash(p1, p2, t, a, prev_hash).
+    Paramètres:
+        message: Message "P1|P2|timestamp|montant" encodé en UTF-8
+        prev_hash: Hash de la transaction précédente (défaut "0" pour la première transaction)
+    Retourne: Hash SHA-256 en hexadécimal (64 caractères)
+    """
+    # Formaté comme dans compute_hash : un hash stocké nul ou non textuel (tx.json modifié à la main)
+    # donne un hash différent au lieu d'une erreur
+    return hashlib.sha256(message + b"|" + f"{prev_hash}".encode("utf-8")).hexdigest()
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    """
+    Retourne le pool de processus de calcul des hashs, en le créant au premier appel.
+    Les processus sont démarrés avec "spawn" (et non fork) : le serveur peut avoir plusieurs
+    threads en cours, et un fork à ce moment-là peut bloquer le processus enfant.
+    Retourne: Pool de processus partagé
+    """
+    global _hash_pool
+    with _cache_lock:  # Un seul pool, même si deux /verify démarrent en même temps
+        if _hash_pool is None:
+            _hash_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+        return _hash_pool
+
+
+def compute_hashes_batch(messages: List[bytes], prev_hashes: List[str]) -> List[str]:
+    """
+    Calcule les hashs chaînés d'une liste de transactions, en parallèle s'il y en a beaucoup.
+    Chaque hash ne dépend que de son message et du hash précédent attendu (connu d'avance) :
+    les calculs sont indépendants et peuvent être répartis sur plusieurs processus.
+    Paramètres:
+        messages: Messages "P1|P2|t|a" encodés (voir signing_bytes)
+        prev_hashes: Hash précédent attendu pour chaque message (même longueur)
+    Retourne: Hashs calculés en hexadécimal, dans le même ordre
+    """
+    cpus = os.cpu_count() or 1
+    if len(messages) >= HASH_POOL_MIN and cpus > 1:
+        # Gros paquets : un seul envoi par paquet au lieu d'un par transaction
+        chunksize = max(1024, len(messages) // (4 * cpus))
+        return list(_get_hash_pool().map(compute_hash_from_message, messages, prev_hashes, chunksize=chunksize))
+    return list(map(compute_hash_from_message, messages, prev_hashes))
+
+
+def verify_signatures_batch(txs: List[Dict[str, Any]],
+                            messages: Optional[List[Optional[bytes]]] = None) -> List[Optional[bool]]:
+    """
+    Vérifie les signatures d'une liste de transactions (v4), en parallèle s'il y en a beaucoup.
+    Les clés publiques sont chargées une seule fois par personne ; les vérifications RSA
+    (calcul en C dans OpenSSL) sont ensuite réparties sur un pool de threads.
+    Une signature déjà vérifiée valide avec la même clé n'est pas revérifiée (voir _keys_cache["verified"]) :
+    après la modification d'une transaction, seules les signatures nouvelles ou modifiées sont recalculées.
+    Paramètres:
+        txs: Transactions à vérifier
+        messages: Messages signés déjà encodés, alignés sur txs (voir signing_bytes) ; calculés si absents
+    Retourne: Liste alignée sur txs : True/False pour chaque transaction signée, None si pas de signature
+    """
+    if messages is None:
+        messages = [signing_bytes(tx) for tx in txs]
+    results = [None] * len(txs)  # None = pas de signature à vérifier
+    jobs = []  # (index, clé publique, message, signature) pour chaque transaction signée
+    memo_keys = []  # Empreinte de chaque job, pour mémoriser les signatures valides
+    with _cache_lock:  # Clés et ensemble des signatures vérifiées lus pour la même version de keys.json
+        for i, tx in enumerate(txs):
+            message = messages[i]  # Message exact qui a été signé (None si champs manquants)
+            if "signature" in tx and message is not None:
+                public_key = get_public_key_object(tx["p1"])
+                signature = tx["signature"]
+                # Longueur du message en préfixe : la frontière message/signature est non ambiguë
+                memo_key = (tx["p1"], hashlib.sha256(
+                    len(message).to_bytes(8, "big") + message + f"{signature}".encode("utf-8")).digest())
+                if memo_key in _keys_cache["verified"]:
+                    results[i] = True  # Déjà vérifiée valide avec cette clé
+                    continue
+                jobs.append((i, public_key, message, signature))
+                memo_keys.append(memo_key)
+        verified = _keys_cache["verified"]  # Si les clés changent pendant la vérification, cet ensemble est abandonné
+    
+    def check(job):
+        _, public_key, message, signature = job
+        return verify_signature(public_key, message, signature)
+    
+    if len(jobs) >= SIGNATURE_POOL_MIN and (os.cpu_count() or 1) > 1:
+        with ThreadPoolExecutor() as executor:  # Un thread par cœur (environ)
+            valid = list(executor.map(check, jobs))
+    else:
+        valid = [check(job) for job in jobs]
+    
+    for (i, _, _, _), memo_key, ok in zip(jobs, memo_keys, valid):
+        results[i] = ok
+        if ok:
+            verified.add(memo_key)
+    return results
+
+
+# ===== ARBRE DE MERKLE =====
+# Feuilles = transactions dans l'ordre du fichier ; feuille = SHA-256(0x00 | h), nœud = SHA-256(0x01 | gauche | droite).
+# Les préfixes 0x00/0x01 empêchent de faire passer un nœud interne pour une feuille.
+# Un nœud sans voisin (dernier d'un niveau de taille impaire) remonte tel quel au niveau supérieur.
+# Le hash chaîné reste la référence de /verify ; l'arbre permet en plus de prouver en O(log N)
+# qu'une transaction fait partie du registre (preuve d'appartenance) sans rejouer toute la chaîne.
+
+def _merkle_leaf(h: str) -> bytes:
+    """
+    Calcule la feuille de l'arbre de Merkle pour le hash chaîné d'une transaction.
+    Paramètre: h - Hash chaîné de la transaction (hexadécimal)
+    Retourne: Feuille (32 octets)
+    """
+    return hashlib.sha256(b"\x00" + f"{h}".encode("utf-8")).digest()
+
+
+def _merkle_node(left: bytes, right: bytes) -> bytes:
+    """
+    Calcule un nœud interne de l'arbre de Merkle à partir de ses deux enfants.
+    Paramètres:
+        left: Enfant gauche (32 octets)
+        right: Enfant droit (32 octets)
+    Retourne: Nœud parent (32 octets)
+    """
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _merkle_build(leaves: List[bytes]) -> List[List[bytes]]:
+    """
+    Construit tout l'arbre de Merkle niveau par niveau (O(N) hashs au total).
+    Paramètre: leaves - Feuilles dans l'ordre des transactions
+    Retourne: Liste des niveaux, du niveau des feuilles (0) jusqu'à la racine (dernier niveau)
+    """
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        row = levels[-1]
+        parents = [_merkle_node(row[i], row[i + 1]) for i in range(0, len(row) - 1, 2)]
+        if len(row) % 2:  # Dernier nœud sans voisin : remonte tel quel
+            parents.append(row[-1])
+        levels.append(parents)
+    return levels
+
+
+def _merkle_append(levels: List[List[bytes]], leaf: bytes) -> None:
+    """
+    Ajoute une feuille à l'arbre et recalcule uniquement ses ancêtres (O(log N) hashs).
+    Paramètres:
+        levels: Niveaux de l'arbre (modifiés sur place)
+        leaf: Nouvelle feuille
+    """
+    levels[0].append(leaf)
+    i = len(levels[0]) - 1  # Position du nœud modifié dans le niveau courant
+    level = 0
+    while len(levels[level]) > 1:
+        row = levels[level]
+        # Index impair : le voisin gauche existe ; index pair (dernier du niveau) : remonte tel quel
+        parent = _merkle_node(row[i - 1], row[i]) if i % 2 else row[i]
+        if level + 1 == len(levels):  # L'arbre gagne un niveau
+            levels.append([])
+        upper = levels[level + 1]
+        i //= 2
+        if i < len(upper):
+            upper[i] = parent  # Parent existant à mettre à jour
+        else:
+            upper.append(parent)  # Nouveau parent
+        level += 1
+
+
+def get_merkle_tree() -> List[List[bytes]]:
+    """
+    Retourne l'arbre de Merkle des transactions actuelles, en le construisant s'il n'existe pas encore.
+    Ensuite, chaque nouvelle transaction le met à jour en O(log N) (voir _index_transaction).
+    Retourne: Niveaux de l'arbre (voir _merkle_build)
+    """
+    with _cache_lock:  # Un seul thread construit l'arbre ; aucun ajout pendant la construction
+        txs = load_transactions()  # Met à jour le cache (et efface l'arbre) si le fichier a changé
+        if _tx_cache["merkle"] is None:
+            _tx_cache["merkle"] = _merkle_build([_merkle_leaf(tx.get("h", "")) for tx in txs])
+        return _tx_cache["merkle"]
+
+
+def merkle_proof(levels: List[List[bytes]], index: int) -> List[Dict[str, str]]:
+    """
+    Construit la preuve d'appartenance d'une feuille : les voisins sur le chemin jusqu'à la racine.
+    Paramètres:
+        levels: Niveaux de l'arbre
+        index: Position de la feuille (position de la transaction dans le fichier)
+    Retourne: Liste de {"side": "left"|"right", "hash": voisin en hexadécimal}, de la feuille vers la racine
+    """
+    proof = []
+    for row in levels[:-1]:  # Tous les niveaux sauf la racine
+        sibling = index ^ 1  # Voisin : même parent, autre côté
+        if sibling < len(row):  # Pas de voisin : le nœud remonte tel quel, rien à ajouter
+            proof.append({"side": "left" if sibling < index else "right", "hash": row[sibling].hex()})
+        index //= 2
+    return proof
+
+
+def merkle_root_from_proof(h: str, proof: List[Dict[str, str]]) -> str:
+    """
+    Recalcule la racine de l'arbre à partir du hash d'une transaction et de sa preuve (O(log N)).
+    Paramètres:
+        h: Hash chaîné de la transaction
+        proof: Preuve d'appartenance (voir merkle_proof)
+    Retourne: Racine obtenue en hexadécimal (à comparer avec la racine attendue)
+    """
+    node = _merkle_leaf(h)
+    for step in proof:
+        sibling = bytes.fromhex(step["hash"])
+        node = _merkle_node(sibling, node) if step["side"] == "left" else _merkle_node(node, sibling)
+    return node.hex()
+
+
+def sha256_backend_info() -> Dict[str, Any]:
+    """
+    Décrit l'implémentation de SHA-256 utilisée par hashlib (compute_hash, /verify).
+    hashlib délègue SHA-256 à OpenSSL, qui choisit au démarrage le code le plus rapide pour le
+    processeur (instructions SHA-NI sur x86, extensions cryptographiques ARMv8) à partir de la 1.1.1.
+    Retourne: Dictionnaire {"openssl": version, "openssl_sha256": booléen, "cpu_sha_extensions": booléen ou None}
+    """
+    cpu_sha = None  # Inconnu si /proc/cpuinfo n'est pas disponible (autre système que Linux)
+    try:
+        flags = set(Path("/proc/cpuinfo").read_text(errors="ignore").split())
+        cpu_sha = "sha_ni" in flags or "sha2" in flags  # "sha_ni" sur x86, "sha2" sur ARMv8
+    except OSError:
+        pass
+    return {
+        "openssl": ssl.OPENSSL_VERSION,  # Ex: "OpenSSL 3.0.17 1 Jul 2025"
+        # Fonction fournie par OpenSSL (et non l'implémentation de secours en C de Python)
+        "openssl_sha256": hashlib.sha256.__name__ == "openssl_sha256",
+        "cpu_sha_extensions": cpu_sha,
+    }
+
+
+def check_sha256_backend() -> None:
+    """
+    Affiche au démarrage l'implémentation de SHA-256 utilisée et prévient si elle n'est pas accélérée :
+    hashlib sans OpenSSL, ou OpenSSL antérieur à 1.1.1 (pas de détection des instructions SHA du processeur).
+    """
+    info = sha256_backend_info()
+    app.logger.info("SHA-256 : %s, hashlib via OpenSSL : %s, instructions SHA du processeur : %s",
+                    info["openssl"], info["openssl_sha256"], info["cpu_sha_extensions"])
+    if not info["openssl_sha256"] or ssl.OPENSSL_VERSION_INFO < (1, 1, 1):
+        app.logger.warning("SHA-256 non accéléré : utiliser un Python lié à OpenSSL >= 1.1.1 "
+                           "pour profiter des instructions SHA-NI / ARMv8 dans compute_hash et /verify")
+
+
+def chronological_transactions() -> List[Dict[str, Any]]:
+    """
+    Retourne toutes les transactions dans l'ordre chronologique, sans trier à chaque appel.
+    Cas habituel (ajouts dans l'ordre) : la liste en cache est déjà triée et retournée telle quelle.
+    Sinon, une vue triée est construite une fois, puis maintenue par insertion dichotomique.
+    Retourne: Liste des transactions triées par timestamp (à ne pas modifier)
+    """
+    with _cache_lock:
+        txs = load_transactions()  # Met à jour le cache et les index si le fichier a changé
+        if _tx_cache["ordered"]:
+            return txs
+        if _tx_cache["chrono"] is None:
+            # Tri stable par timestamp (key=lambda: fonction de tri, par champ "t")
+            _tx_cache["chrono"] = sorted(txs, key=lambda tx: tx.get("t", ""))
+            _tx_cache["chrono_keys"] = [tx.get("t", "") for tx in _tx_cache["chrono"]]
+        return _tx_cache["chrono"]
+
+
+def _warm_caches() -> None:
+    """
+    Charge à l'avance les transactions, leurs index et les clés publiques (objets clés compris).
+    Appelée par wsgi.py avant le fork des workers gunicorn (--preload) : chaque worker hérite
+    des caches déjà remplis au lieu de relire et décoder les fichiers à sa première requête.
+    """
+    load_transactions()  # Transactions + index (soldes, transactions par personne, dernière transaction)
+    for person in load_public_keys():
+        get_public_key_object(person)  # Analyse chaque PEM une seule fois
+
+
 # ===== INITIALISATION DE L'APPLICATION FLASK =====
 app = Flask(__name__)  # Crée l'instance de l'application Flask (__name__ = nom du module)
 
 
+# Nombre de transactions encodées par morceau quand une longue liste est envoyée en flux (streaming)
+STREAM_CHUNK = 1000
+
+
+def json_list_stream_response(items: List[Any]):
+    """
+    Crée une réponse HTTP JSON pour une longue liste, envoyée en flux par morceaux de STREAM_CHUNK éléments.
+    Seul le morceau en cours est encodé en mémoire (et non toute la réponse) et les premiers
+    octets partent vers le client avant que toute la liste soit encodée.
+    Paramètre: items - Liste à encoder (une copie des références est faite : la liste peut changer ensuite)
+    Retourne: Réponse Flask en flux avec le type MIME application/json
+    """
+    snapshot = list(items)  # Copie des références seulement (les transactions ne sont pas copiées)
+    
+    def generate():
+        yield b"["
+        for start in range(0, len(snapshot), STREAM_CHUNK):
+            # orjson encode le morceau en "[...]" : on retire les crochets pour l'insérer dans le tableau
+            chunk = orjson.dumps(snapshot[start:start + STREAM_CHUNK])[1:-1]
+            yield chunk if start == 0 else b"," + chunk
+        yield b"]"
+    
+    return app.response_class(generate(), mimetype="application/json")
+
+
+def json_response(obj: Any):
+    """
+    Crée une réponse HTTP JSON encodée avec orjson (remplace flask.jsonify, bien plus lent sur de gros volumes).
+    S'utilise comme jsonify : "return json_response(...), 400" pour un autre code HTTP.
+    Paramètre: obj - Objet Python à encoder (dictionnaire, liste, ...)
+    Retourne: Réponse Flask avec le type MIME application/json
+    """
+    return app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+
 # ===== ENDPOINT A1: ENREGISTRER UNE TRANSACTION =====
 @app.post("/transactions")  # Décorateur Flask: route HTTP POST vers /transactions
 def add_transaction():
@@ -182,67 +797,78 @@ def add_transaction():
     required = {"p1", "p2", "a"}
     # Vérifie que tous les champs requis sont présents dans le payload
     if not required.issubset(payload):
-        return jsonify({"error": "Champs requis: p1, p2, a"}), 400  # Code HTTP 400 = Bad Request
+        return json_response({"error": "Champs requis: p1, p2, a"}), 400  # Code HTTP 400 = Bad Request
 
     # Extrait les valeurs du payload
     p1 = payload["p1"]  # Expéditeur (obligatoire)
     p2 = payload["p2"]  # Destinataire (obligatoire)
     a = payload["a"]  # Montant (obligatoire)
-    t = payload.get("t") or now_iso()  # Timestamp: utilise celui fourni ou génère un nouveau (optionnel)
+    signature = payload.get("signature")  # Récupère la signature si présente (optionnel pour compatibilité v1-v3)
+    t = payload.get("t")  # Timestamp fourni (optionnel)
+    if not t and signature:
+        t = now_iso()  # Transaction signée sans timestamp ; sinon, horodatage pris sous le verrou (plus bas)
     
     # ===== VÉRIFICATION DE LA SIGNATURE (v4) =====
-    signature = payload.get("signature")  # Récupère la signature si présente (optionnel pour compatibilité v1-v3)
     if signature:  # Si une signature est fournie, on vérifie (v4)
         public_key_pem = get_public_key(p1)  # Récupère la clé publique de l'expéditeur
         if not public_key_pem:  # Si la clé publique n'est pas enregistrée
-            return jsonify({
+            return json_response({
                 "error": f"Clé publique non trouvée pour {p1}. Enregistrez d'abord la clé publique avec POST /keys/{p1}"
             }), 400  # Erreur: clé publique manquante
         
         # Reconstruit le message exact qui a été signé (même format que lors de la signature)
-        message = get_transaction_data_for_signing(p1, p2, t, a)
-        # Vérifie que la signature correspond au message avec la clé publique
-        if not verify_signature(public_key_pem, message, signature):
-            return jsonify({"error": "Signature invalide"}), 400  # Erreur: signature invalide
+        message = get_transaction_data_for_signing(p1, p2, t, a).encode("utf-8")
+        # Vérifie que la signature correspond au message avec la clé publique (objet clé mis en cache)
+        if not verify_signature(get_public_key_object(p1), message, signature):
+            return json_response({"error": "Signature invalide"}), 400  # Erreur: signature invalide
     else:
         # Compatibilité avec v1-v3 (pas de signature requise)
         pass
 
     # ===== CRÉATION DE LA TRANSACTION =====
-    txs = load_transactions()  # Charge toutes les transactions existantes
-    tx_id = len(txs) + 1  # Génère un ID unique (nombre de transactions + 1)
-    
-    # ===== CALCUL DU HASH CHAÎNÉ (v3) =====
-    # Récupérer le hash de la transaction précédente pour créer la chaîne
-    prev_hash = "0"  # Hash initial pour la première transaction (pas de transaction précédente)
-    if txs:  # S'il existe déjà des transactions
-        # Trier par timestamp pour obtenir la dernière transaction chronologiquement
-        sorted_txs = sorted(txs, key=lambda tx: tx.get("t", ""))
-        last_tx = sorted_txs[-1]  # Dernière transaction (la plus récente)
-        if "h" in last_tx:  # Si cette transaction a un hash (v2+)
+    # Verrou sur le fichier : aucune autre transaction ne peut être ajoutée entre la lecture
+    # de la dernière transaction (hash précédent) et l'écriture de la nouvelle
+    with locked_tx_file() as f:
+        if not payload.get("t") and not signature:
+            # Horodatage pris sous le verrou : l'ordre chronologique reste celui de la chaîne de hashs
+            # (une transaction signée garde le timestamp qui a été signé)
+            t = now_iso()
+        txs = load_transactions()  # Charge toutes les transactions existantes
+        tx_id = len(txs) + 1  # Génère un ID unique (nombre de transactions + 1)
+        
+        # ===== CALCUL DU HASH CHAÎNÉ (v3) =====
+        # Récupérer le hash de la transaction précédente pour créer la chaîne
+        prev_hash = "0"  # Hash initial pour la première transaction (pas de transaction précédente)
+        # Dernière transaction chronologiquement, maintenue en mémoire (pas de tri de toutes les transactions)
+        last_tx = _tx_cache["last_tx"]
+        if last_tx is not None and "h" in last_tx:  # Si cette transaction a un hash (v2+)
             prev_hash = last_tx["h"]  # Utilise ce hash comme hash précédent
-    
-    # Calcul du hash de la transaction (P1, P2, t, a, h_prev) - hash chaîné (v3)
-    h = compute_hash(p1, p2, t, a, prev_hash)
-    
-    # Crée le dictionnaire représentant la transaction
-    tx = {
-        "id": tx_id,  # Identifiant unique de la transaction
-        "p1": p1,  # Expéditeur
-        "p2": p2,  # Destinataire
-        "a": a,  # Montant
-        "t": t,  # Timestamp ISO8601
-        "h": h,  # Hash chaîné de la transaction (SHA-256)
-    }
-    
-    # Ajouter la signature si présente (v4)
-    if signature:
-        tx["signature"] = signature  # Ajoute le champ signature à la transaction
-    
-    # Sauvegarde la transaction dans la liste
-    txs.append(tx)  # Ajoute la nouvelle transaction à la liste
-    save_transactions(txs)  # Sauvegarde toutes les transactions dans le fichier JSON
-    return jsonify(tx), 201  # Retourne la transaction créée avec code HTTP 201 (Created)
+        
+        # Calcul du hash de la transaction (P1, P2, t, a, h_prev) - hash chaîné (v3)
+        if signature:
+            # Réutilise le message déjà encodé pour la vérification de la signature
+            h = compute_hash_from_message(message, prev_hash)
+        else:
+            h = compute_hash(p1, p2, t, a, prev_hash)
+        
+        # Crée le dictionnaire représentant la transaction
+        tx = {
+            "id": tx_id,  # Identifiant unique de la transaction
+            "p1": p1,  # Expéditeur
+            "p2": p2,  # Destinataire
+            "a": a,  # Montant
+            "t": t,  # Timestamp ISO8601
+            "h": h,  # Hash chaîné de la transaction (SHA-256)
+        }
+        
+        # Ajouter la signature si présente (v4)
+        if signature:
+            tx["signature"] = signature  # Ajoute le champ signature à la transaction
+        
+        # Ajoute la transaction à la fin du fichier JSON (sans réécrire les précédentes)
+        append_transaction(f, tx)
+    schedule_verify()  # Le rapport de /verify sera prêt avant la prochaine vérification
+    return json_response(tx), 201  # Retourne la transaction créée avec code HTTP 201 (Created)
 
 
 # ===== ENDPOINT: ENREGISTRER UNE CLÉ PUBLIQUE (v4) =====
@@ -256,21 +882,23 @@ def register_public_key(person: str):
     payload = request.get_json(silent=True) or {}  # Récupère le JSON de la requête
     public_key_pem = payload.get("public_key")  # Extrait la clé publique du payload
     if not public_key_pem:  # Vérifie que la clé publique est fournie
-        return jsonify({"error": "Champ requis: public_key (format PEM)"}), 400
+        return json_response({"error": "Champ requis: public_key (format PEM)"}), 400
     
     # Vérifier que la clé est valide (format PEM correct)
     try:
-        # Tente de charger la clé publique depuis le format PEM
-        serialization.load_pem_public_key(
+        # Tente de charger la clé publique depuis le format PEM (l'objet obtenu est gardé en cache)
+        public_key = serialization.load_pem_public_key(
             public_key_pem.encode('utf-8'),  # Convertit la chaîne PEM en bytes
-            backend=default_backend()  # Backend cryptographique
-        )
+        )  # Plus d'argument backend : cryptography >= 3.1 utilise toujours le backend OpenSSL
     except Exception:  # Si le chargement échoue, la clé est invalide
-        return jsonify({"error": "Clé publique invalide (format PEM attendu)"}), 400
+        return json_response({"error": "Clé publique invalide (format PEM attendu)"}), 400
+    if not isinstance(public_key, SUPPORTED_KEY_TYPES):  # Ex: clé EC ou DSA, non utilisable pour vérifier
+        return json_response({"error": "Type de clé non supporté (RSA ou Ed25519 attendu)"}), 400
     
     # Si la clé est valide, on l'enregistre
-    save_public_key(person, public_key_pem)  # Sauvegarde la clé publique dans le fichier JSON
-    return jsonify({"person": person, "status": "Clé publique enregistrée"}), 201  # Code 201 = Created
+    save_public_key(person, public_key_pem, public_key)  # Sauvegarde la clé publique dans le fichier JSON
+    schedule_verify()  # Une nouvelle clé peut changer la validité des signatures
+    return json_response({"person": person, "status": "Clé publique enregistrée"}), 201  # Code 201 = Created
 
 
 # ===== ENDPOINT: RÉCUPÉRER UNE CLÉ PUBLIQUE (v4) =====
@@ -283,8 +911,8 @@ def get_person_public_key(person: str):
     """
     public_key_pem = get_public_key(person)  # Récupère la clé publique depuis le stockage
     if not public_key_pem:  # Si la clé n'existe pas
-        return jsonify({"error": f"Clé publique non trouvée pour {person}"}), 404  # Code 404 = Not Found
-    return jsonify({"person": person, "public_key": public_key_pem})  # Retourne la clé publique
+        return json_response({"error": f"Clé publique non trouvée pour {person}"}), 404  # Code 404 = Not Found
+    return json_response({"person": person, "public_key": public_key_pem})  # Retourne la clé publique
 
 
 # ===== ENDPOINT A2: LISTER TOUTES LES TRANSACTIONS =====
@@ -294,9 +922,10 @@ def list_transactions():
     A2: Liste de toutes les transactions dans l'ordre chronologique.
     Retourne: Tableau JSON de toutes les transactions triées par timestamp
     """
-    # Charge toutes les transactions et les trie par timestamp (ordre chronologique)
-    txs = sorted(load_transactions(), key=lambda tx: tx["t"])  # key=lambda: fonction de tri (par champ "t")
-    return jsonify(txs)  # Retourne la liste triée en JSON
+    txs = chronological_transactions()  # Transactions triées par timestamp (sans tri à chaque appel)
+    if len(txs) > STREAM_CHUNK:
+        return json_list_stream_response(txs)  # Longue liste : envoyée en flux, morceau par morceau
+    return json_response(txs)  # Retourne la liste triée en JSON
 
 
 # ===== ENDPOINT A3: LISTER LES TRANSACTIONS D'UNE PERSONNE =====
@@ -307,11 +936,14 @@ def list_transactions_for_person(person: str):
     Paramètre URL: person - Nom de la personne
     Retourne: Tableau JSON des transactions où la personne est p1 (expéditeur) ou p2 (destinataire)
     """
-    # Charge toutes les transactions et les trie par timestamp
-    txs = sorted(load_transactions(), key=lambda tx: tx["t"])
-    # Filtre les transactions: garde seulement celles où la personne est expéditeur (p1) ou destinataire (p2)
-    filtered = [tx for tx in txs if tx["p1"] == person or tx["p2"] == person]
-    return jsonify(filtered)  # Retourne la liste filtrée en JSON
+    load_transactions()  # Met à jour le cache et les index si le fichier a changé
+    # Transactions où la personne est expéditeur (p1) ou destinataire (p2), maintenues par l'index
+    # dans l'ordre d'ajout (pas de parcours de tout le registre)
+    filtered = _tx_cache["by_person"].get(person, [])
+    if person in _tx_cache["unordered_persons"]:
+        # Une transaction plus ancienne a été ajoutée après une plus récente : tri par timestamp
+        filtered = sorted(filtered, key=lambda tx: tx["t"])
+    return json_response(filtered)  # Retourne la liste filtrée en JSON
 
 
 # ===== ENDPOINT A4: CALCULER LE SOLDE D'UNE PERSONNE =====
@@ -322,37 +954,167 @@ def balance(person: str):
     Paramètre URL: person - Nom de la personne
     Retourne: Solde (positif si la personne a reçu plus qu'elle n'a envoyé, négatif sinon)
     """
-    txs = load_transactions()  # Charge toutes les transactions
-    # Calcule la somme des montants reçus (transactions où la personne est destinataire p2)
-    incoming = sum(tx["a"] for tx in txs if tx.get("p2") == person)
-    # Calcule la somme des montants envoyés (transactions où la personne est expéditeur p1)
-    outgoing = sum(tx["a"] for tx in txs if tx.get("p1") == person)
+    load_transactions()  # Met à jour le cache et les index si le fichier a changé
+    # Totaux maintenus à chaque transaction : somme des montants reçus (p2) et envoyés (p1), en O(1)
+    incoming, outgoing = _tx_cache["totals"].get(person, (0, 0))
     # Retourne le solde (entrées - sorties)
-    return jsonify({"person": person, "balance": incoming - outgoing})
+    return json_response({"person": person, "balance": incoming - outgoing})
+
+
+# ===== ENDPOINT: SOLDES DE TOUTES LES PERSONNES =====
+@app.get("/balances")  # Route GET vers /balances
+def balances():
+    """
+    Soldes de toutes les personnes apparaissant dans au moins une transaction (vue d'administration).
+    Retourne: Objet JSON {personne: solde}, solde = entrées - sorties
+    """
+    load_transactions()  # Met à jour le cache et les index si le fichier a changé
+    # Un seul passage sur les totaux déjà maintenus par personne (pas de parcours des transactions)
+    return json_response({
+        person: incoming - outgoing
+        for person, (incoming, outgoing) in _tx_cache["totals"].items()
+    })
 
 
 # ===== ENDPOINT A5: VÉRIFIER L'INTÉGRITÉ DES DONNÉES =====
-@app.get("/verify")  # Route GET vers /verify
-def verify_integrity():
+# Dernier rapport de vérification calculé : (empreinte des fichiers de transactions et de clés, rapport).
+# Tant que ni tx.json ni keys.json n'ont changé, le rapport est renvoyé tel quel (O(1)).
+_verify_cache = (None, None)
+_verify_event = threading.Event()  # Signalé après chaque écriture : le rapport est à recalculer
+_verify_worker = None  # Thread de recalcul en arrière-plan (un par processus, démarré à la première écriture)
+VERIFY_DELAY = 0.2  # Secondes sans nouvelle écriture avant de recalculer (une seule fois par rafale d'ajouts)
+# Champs renvoyés par GET /verify?summary=1 (statut et compteurs seulement)
+VERIFY_SUMMARY_KEYS = ("status", "valid", "total_transactions", "valid_count", "invalid_count")
+
+
+def _verify_snapshot(cached_stamp: Optional[tuple]) -> tuple:
+    """
+    Met à jour les caches et capture, de manière cohérente, ce qu'il faut pour une vérification.
+    Paramètre: cached_stamp - Empreinte du dernier rapport calculé (voir _verify_cache)
+    Retourne: Tuple (empreinte (tx.json, keys.json), copie des transactions dans l'ordre chronologique),
+    ou (empreinte, None) si l'empreinte est celle du dernier rapport (rien à recopier ni à recalculer)
+    """
+    with _cache_lock:  # Aucun ajout entre la lecture des empreintes et la copie des transactions
+        load_transactions()  # Met à jour le cache des transactions si tx.json a changé
+        load_public_keys()  # Met à jour le cache des clés si keys.json a changé
+        stamp = (_tx_cache["stamp"], _keys_cache["stamp"])
+        if stamp == cached_stamp:  # Rapport en cache toujours valable : O(1), pas de copie
+            return stamp, None
+        # Transactions dans l'ordre chronologique (vue triée maintenue en cache : pas de tri à chaque
+        # vérification). Copie : un ajout simultané ne doit pas décaler les colonnes du rapport.
+        return stamp, list(chronological_transactions())
+
+
+def _refresh_verify() -> tuple:
+    """
+    Met à jour si besoin le rapport de vérification et le retourne avec l'empreinte des fichiers vérifiés.
+    Retourne: Tuple (empreinte (tx.json, keys.json), rapport)
+    """
+    global _verify_cache
+    cached = _verify_cache
+    stamp, sorted_txs = _verify_snapshot(cached[0])
+    if sorted_txs is None:
+        return cached
+    _verify_cache = (stamp, compute_verify_report(sorted_txs))  # Remplacé d'un bloc : rapport et empreinte vont ensemble
+    return _verify_cache
+
+
+def refresh_verify_report() -> Dict[str, Any]:
+    """
+    Retourne le rapport de vérification des données actuelles, recalculé seulement si tx.json ou
+    keys.json ont changé depuis le dernier calcul (écriture par l'API ou modification à la main).
+    Retourne: Rapport de vérification (voir compute_verify_report)
     """
-    A5: Vérifie l'intégrité des données en recalculant les hashs et en les comparant avec les hashs stockés.
+    return _refresh_verify()[1]
+
+
+def _verify_etag(stamp: tuple, summary: bool) -> str:
+    """
+    Construit l'ETag d'une réponse de GET /verify : le rapport ne dépend que du contenu de tx.json et
+    de keys.json, identifiés par leur empreinte (date de modification, taille).
+    Paramètres:
+        stamp: Empreinte (tx.json, keys.json)
+        summary: True pour la réponse résumée (?summary=1), qui est une autre représentation
+    Retourne: Valeur de l'ETag (sans guillemets)
+    """
+    (tx_mtime, tx_size), (keys_mtime, keys_size) = stamp
+    return f"{tx_mtime}-{tx_size}-{keys_mtime}-{keys_size}" + ("-summary" if summary else "")
+
+
+def _verify_worker_loop() -> None:
+    """
+    Boucle du thread d'arrière-plan : après chaque rafale d'écritures, recalcule le rapport de
+    vérification pour que le prochain GET /verify le trouve déjà prêt.
+    """
+    while True:
+        _verify_event.wait()
+        # Attend que les écritures se calment : un seul recalcul pour une rafale de transactions
+        while _verify_event.is_set():
+            _verify_event.clear()
+            time.sleep(VERIFY_DELAY)
+        try:
+            refresh_verify_report()
+        except Exception:  # Fichier en cours de modification à la main, etc. : GET /verify recalculera
+            app.logger.exception("Échec du recalcul de /verify en arrière-plan")
+
+
+def schedule_verify() -> None:
+    """
+    Demande le recalcul du rapport de vérification en arrière-plan (après un ajout ou une nouvelle clé).
+    Le thread est démarré à la première demande dans chaque processus (les threads ne survivent pas
+    au fork des workers gunicorn).
+    """
+    global _verify_worker
+    with _cache_lock:
+        if _verify_worker is None or not _verify_worker.is_alive():
+            _verify_worker = threading.Thread(target=_verify_worker_loop, name="verify-worker", daemon=True)
+            _verify_worker.start()
+    _verify_event.set()
+
+
+def compute_verify_report(sorted_txs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Vérifie l'intégrité des données en recalculant les hashs et en les comparant avec les hashs stockés.
     v3: Vérifie aussi la chaîne de hashs (chaque hash dépend du précédent).
     v4: Vérifie aussi les signatures cryptographiques.
+    Paramètre: sorted_txs - Toutes les transactions, dans l'ordre chronologique
     Retourne: Rapport détaillé avec les transactions valides et invalides
     """
-    txs = load_transactions()  # Charge toutes les transactions depuis le fichier
     valid_txs = []  # Liste des IDs des transactions valides
     invalid_txs = []  # Liste des transactions invalides avec détails
     
-    # Trier les transactions par timestamp pour vérifier la chaîne dans l'ordre chronologique
-    sorted_txs = sorted(txs, key=lambda tx: tx.get("t", ""))
     prev_hash = "0"  # Hash initial pour la première transaction (pas de transaction précédente)
     
+    # Colonnes extraites une seule fois, alignées sur sorted_txs : la boucle parcourt ces listes
+    # en parallèle (zip) au lieu de relire les champs dans chaque dictionnaire
+    stored_hashes = [tx.get("h") for tx in sorted_txs]  # Hashs stockés (None si absent)
+    # Message "P1|P2|t|a" encodé une seule fois par transaction : sert au hash ET à la signature
+    messages = [signing_bytes(tx) for tx in sorted_txs]
+    # Vérifie toutes les signatures d'un coup (clés chargées une fois, en parallèle si nombreuses)
+    signature_results = verify_signatures_batch(sorted_txs, messages)
+    
+    # Hash précédent attendu pour chaque transaction : le hash stocké de la dernière transaction
+    # vérifiable qui la précède (celles sans hash ou avec des champs manquants sont ignorées).
+    # Connu d'avance, il permet de recalculer tous les hashs d'un coup, en parallèle si nombreux.
+    checked = []  # Positions des transactions dont le hash est à recalculer
+    expected_prev_hashes = []
+    for j, (tx, stored_hash, message) in enumerate(zip(sorted_txs, stored_hashes, messages)):
+        if message is not None and (stored_hash is not None or "h" in tx):
+            checked.append(j)
+            expected_prev_hashes.append(prev_hash)
+            prev_hash = stored_hash
+    computed_hashes = [None] * len(sorted_txs)
+    batch = compute_hashes_batch([messages[j] for j in checked], expected_prev_hashes)
+    for j, computed_hash in zip(checked, batch):
+        computed_hashes[j] = computed_hash
+    prev_hash = "0"  # La boucle ci-dessous reparcourt la chaîne depuis le début
+    
     # Parcourt chaque transaction dans l'ordre chronologique
-    for tx in sorted_txs:
+    for tx, stored_hash, message, signature_result, computed_hash in zip(
+            sorted_txs, stored_hashes, messages, signature_results, computed_hashes):
         # ===== VÉRIFICATION: TRANSACTION V1 SANS HASH =====
         # Vérifier si la transaction a un hash (compatibilité v1/v2)
-        if "h" not in tx:  # Transaction v1 n'a pas de hash
+        if stored_hash is None and "h" not in tx:  # Transaction v1 n'a pas de hash
             invalid_txs.append({
                 "id": tx.get("id"),  # ID de la transaction
                 "reason": "Transaction v1 sans hash",  # Raison de l'invalidité
@@ -362,8 +1124,7 @@ def verify_integrity():
         
         # ===== VÉRIFICATION: CHAMPS OBLIGATOIRES PRÉSENTS =====
         # Recalculer le hash à partir des données (sans utiliser le hash stocké)
-        required_fields = ["p1", "p2", "t", "a"]  # Champs nécessaires pour calculer le hash
-        if not all(field in tx for field in required_fields):  # Vérifie que tous les champs sont présents
+        if message is None:  # Vérifie que tous les champs nécessaires au calcul du hash sont présents
             invalid_txs.append({
                 "id": tx.get("id"),
                 "reason": "Champs manquants pour le calcul du hash",
@@ -372,24 +1133,15 @@ def verify_integrity():
             continue  # Passe à la transaction suivante
         
         # ===== VÉRIFICATION DU HASH CHAÎNÉ (v3) =====
-        # Calculer le hash avec le hash précédent (v3: hash chaîné)
-        computed_hash = compute_hash(tx["p1"], tx["p2"], tx["t"], tx["a"], prev_hash)
-        stored_hash = tx["h"]  # Hash stocké dans la transaction
+        # Hash recalculé avec le hash précédent (v3: hash chaîné), calculé avant la boucle
         
         # Compare le hash calculé avec le hash stocké
         hash_valid = computed_hash == stored_hash
         
         # ===== VÉRIFICATION DE LA SIGNATURE (v4) =====
-        signature_valid = True  # Par défaut valide (pour compatibilité v1-v3)
-        if "signature" in tx:  # Si la transaction a une signature (v4)
-            public_key_pem = get_public_key(tx["p1"])  # Récupère la clé publique de l'expéditeur
-            if public_key_pem:  # Si la clé publique existe
-                # Reconstruit le message exact qui a été signé
-                message = get_transaction_data_for_signing(tx["p1"], tx["p2"], tx["t"], tx["a"])
-                # Vérifie la signature
-                signature_valid = verify_signature(public_key_pem, message, tx["signature"])
-            else:  # Clé publique manquante
-                signature_valid = False
+        # Résultat calculé avant la boucle (toutes les signatures vérifiées en lot)
+        # Par défaut valide (pour compatibilité v1-v3) ; False si signature invalide ou clé publique manquante
+        signature_valid = signature_result is not False
         
         # ===== DÉCISION: TRANSACTION VALIDE OU INVALIDE =====
         if hash_valid and signature_valid:  # Si le hash ET la signature sont valides
@@ -420,25 +1172,120 @@ def verify_integrity():
     is_valid = len(invalid_txs) == 0  # True si aucune transaction invalide
     status = "OK" if is_valid else "KO"  # Statut textuel
     
-    # Retourne le rapport complet en JSON
-    return jsonify({
+    # Retourne le rapport complet
+    return {
         "status": status,  # "OK" ou "KO"
         "valid": is_valid,  # Booléen: toutes les transactions sont valides
-        "total_transactions": len(txs),  # Nombre total de transactions
+        "total_transactions": len(sorted_txs),  # Nombre total de transactions
         "valid_count": len(valid_txs),  # Nombre de transactions valides
         "invalid_count": len(invalid_txs),  # Nombre de transactions invalides
         "valid_transactions": valid_txs,  # Liste des IDs des transactions valides
         "invalid_transactions": invalid_txs  # Liste détaillée des transactions invalides
-    })
+    }
+
+
+@app.get("/verify")  # Route GET vers /verify
+def verify_integrity():
+    """
+    A5: Vérifie l'intégrité des données (hashs chaînés v3 et signatures v4).
+    Le rapport est recalculé seulement si tx.json ou keys.json ont changé depuis le dernier calcul ;
+    après un ajout par l'API, il est en général déjà recalculé en arrière-plan.
+    Paramètre de requête: summary=1 (optionnel) - ne renvoyer que le statut et les compteurs
+    En-tête If-None-Match (optionnel) : ETag d'une réponse précédente ; 304 si les fichiers n'ont pas changé
+    Retourne: Rapport détaillé avec les transactions valides et invalides (ou son résumé), avec un ETag
+    """
+    summary = request.args.get("summary") in ("1", "true")
+    if request.if_none_match:
+        # Requête conditionnelle : deux stat suffisent pour savoir si le client a déjà ce rapport
+        # (pas de copie des transactions, pas de recalcul ni d'encodage JSON)
+        etag = _verify_etag((_file_stamp(TX_FILE), _file_stamp(KEYS_FILE)), summary)
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+    stamp, report = _refresh_verify()
+    if summary:
+        # Résumé de taille constante, sans les listes de transactions (qui grandissent avec le registre)
+        response = json_response({key: report[key] for key in VERIFY_SUMMARY_KEYS})
+    else:
+        response = json_response(report)  # Rapport complet en JSON
+    response.set_etag(_verify_etag(stamp, summary))  # Empreinte des fichiers vérifiés par CE rapport
+    return response
+
+
+# ===== ENDPOINT: RACINE DE L'ARBRE DE MERKLE =====
+@app.get("/merkle")  # Route GET vers /merkle
+def merkle_root():
+    """
+    Racine de l'arbre de Merkle construit sur les hashs de toutes les transactions.
+    Retourne: {"root": racine en hexadécimal (null si aucune transaction), "size": nombre de feuilles}
+    """
+    levels = get_merkle_tree()
+    root = levels[-1][0].hex() if levels[0] else None
+    return json_response({"root": root, "size": len(levels[0])})
+
+
+# ===== ENDPOINT: PREUVE D'APPARTENANCE D'UNE TRANSACTION =====
+@app.get("/merkle/proof/<int:tx_id>")  # Route GET avec l'ID de la transaction dans l'URL
+def merkle_proof_for_transaction(tx_id: int):
+    """
+    Preuve d'appartenance d'une transaction au registre (voisins sur le chemin jusqu'à la racine).
+    Paramètre URL: tx_id - ID de la transaction
+    Retourne: {"id", "index", "h", "proof", "root"} ; vérifiable avec POST /merkle/verify
+    """
+    # Arbre, transactions et preuve lus sous le même verrou : un rechargement ou un ajout
+    # (qui modifie l'arbre sur place) ne peut pas mélanger deux versions du registre
+    with _cache_lock:
+        levels = get_merkle_tree()
+        txs = _tx_cache["data"]  # Transactions à partir desquelles l'arbre a été construit
+        index = tx_id - 1  # Cas habituel : l'ID est la position + 1
+        if not (0 <= index < len(txs) and txs[index].get("id") == tx_id):
+            # Fichier modifié à la main : recherche de la transaction par son ID
+            index = next((i for i, tx in enumerate(txs) if tx.get("id") == tx_id), None)
+            if index is None:
+                return json_response({"error": f"Transaction {tx_id} non trouvée"}), 404
+        body = {
+            "id": tx_id,
+            "index": index,  # Position de la feuille dans l'arbre
+            "h": txs[index].get("h"),  # Hash chaîné de la transaction (donnée de la feuille)
+            "proof": merkle_proof(levels, index),
+            "root": levels[-1][0].hex(),
+        }
+    return json_response(body)
+
+
+# ===== ENDPOINT: VÉRIFIER UNE PREUVE D'APPARTENANCE =====
+@app.post("/merkle/verify")  # Route POST vers /merkle/verify
+def merkle_verify():
+    """
+    Vérifie en O(log N) qu'une transaction fait partie du registre actuel, sans rejouer toute la chaîne.
+    Body JSON: {"h": hash de la transaction, "proof": [{"side": "left"|"right", "hash": "..."}]}
+    Retourne: {"valid": booléen, "computed_root", "root"}
+    """
+    payload = request.get_json(silent=True) or {}
+    h = payload.get("h")
+    proof = payload.get("proof")
+    if not isinstance(h, str) or not isinstance(proof, list):
+        return json_response({"error": "Champs requis: h (chaîne), proof (liste)"}), 400
+    try:
+        computed_root = merkle_root_from_proof(h, proof)
+    except (KeyError, TypeError, ValueError):  # Étape de preuve mal formée (champ manquant, hexadécimal invalide)
+        return json_response({"error": "Preuve mal formée"}), 400
+    levels = get_merkle_tree()
+    root = levels[-1][0].hex() if levels[0] else None
+    return json_response({"valid": computed_root == root, "computed_root": computed_root, "root": root})
 
 
 # ===== POINT D'ENTRÉE PRINCIPAL =====
 if __name__ == "__main__":  # S'exécute seulement si le script est lancé directement (pas importé)
     ensure_storage()  # S'assure que les fichiers de stockage existent avant de démarrer
-    # Démarre le serveur Flask
+    # Sans mode debug, le journal de Flask est au niveau WARNING : le rapport SHA-256 (INFO) ne serait pas affiché
+    app.logger.setLevel(logging.INFO)
+    check_sha256_backend()  # Indique si SHA-256 profite de l'accélération matérielle
+    # Démarre le serveur de développement Flask (en production : gunicorn, voir wsgi.py)
     app.run(
         host="0.0.0.0",  # Écoute sur toutes les interfaces réseau (accessible depuis l'extérieur)
         port=5000,  # Port HTTP 5000
-        debug=True  # Mode debug activé (rechargement automatique, messages d'erreur détaillés)
+        debug=False  # Pas de mode debug (rechargeur et débogueur interactif désactivés)
     )
 
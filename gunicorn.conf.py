@@ -0,0 +1,16 @@
+# Configuration gunicorn pour servir l'API Tchaï en production
+# Utilisation : gunicorn -c gunicorn.conf.py wsgi:app
+import multiprocessing
+
+# ===== ÉCOUTE =====
+bind = "0.0.0.0:5000"  # Même adresse et même port que "python app.py"
+reuse_port = True  # SO_REUSEPORT : le noyau répartit les nouvelles connexions entre les workers
+
+# ===== PROCESSUS ET THREADS =====
+workers = multiprocessing.cpu_count()  # Un worker par cœur (les vérifications SHA-256 / RSA utilisent le CPU)
+worker_class = "gthread"  # Plusieurs threads par worker : une requête lente ne bloque pas les autres
+threads = 4  # Threads par worker
+preload_app = True  # Caches remplis une fois avant le fork (voir wsgi.py), partagés par copie sur écriture
+
+# ===== CONNEXIONS =====
+keepalive = 5  # Secondes pendant lesquelles une connexion HTTP reste ouverte pour les requêtes suivantes
@@ -0,0 +1,41 @@
+"""
+Écriture atomique de fichiers pour les scripts de test et d'attaque.
+
+Même principe que _atomic_write_bytes dans app.py : le serveur ne peut jamais lire un tx.json
+à moitié écrit, et un arrêt brutal du script laisse l'ancien fichier intact.
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """
+    Remplace le contenu d'un fichier de manière atomique : écriture dans un fichier temporaire
+    (un seul appel d'écriture), fsync, puis os.replace (renommage atomique).
+    Paramètres:
+        path: Fichier à remplacer
+        data: Nouveau contenu
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")  # Nom propre au processus (pas de collision)
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())  # Contenu sur disque avant le renommage
+    os.replace(tmp, path)
+
+
+@contextmanager
+def restoring(path: Path, original: bytes):
+    """
+    Remet un fichier dans son état d'origine à la sortie du bloc with, même si le bloc lève une exception
+    (une attaque interrompue ne laisse jamais tx.json modifié).
+    Paramètres:
+        path: Fichier modifié dans le bloc
+        original: Contenu d'origine (bytes), réécrit tel quel avec atomic_write
+    """
+    try:
+        yield
+    finally:
+        atomic_write(path, original)
@@ -0,0 +1,91 @@
+"""
+Vérification du hash chaîné (v3) côté client, pour les scripts de test et d'attaque.
+
+Recalcule la chaîne comme /verify (sans les signatures) : le hash d'une transaction est
+SHA-256("p1|p2|t|a|hash précédent"), où le hash précédent est le hash stocké de la dernière
+transaction hachée qui la précède ("0" pour la première).
+Les hashs précédents étant lus dans le fichier, la chaîne peut être découpée en fenêtres
+contiguës vérifiées indépendamment, en parallèle sur plusieurs processus si elle est longue.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+
+# En dessous de ce nombre de transactions, lancer des processus coûte plus cher que le calcul
+# (même seuil que HASH_POOL_MIN dans app.py)
+POOL_MIN = 20000
+
+
+def _chain_ready(tx: dict) -> bool:
+    """
+    Indique si une transaction participe à la chaîne : elle a un hash et tous les champs du message.
+    Paramètre: tx - Transaction
+    Retourne: True si son hash peut être recalculé
+    """
+    return "h" in tx and all(k in tx for k in ("p1", "p2", "t", "a"))
+
+
+def chain_hash(tx: dict, prev_hash: str) -> str:
+    """
+    Recalcule le hash chaîné d'une transaction à partir de ses champs.
+    Paramètres:
+        tx: Transaction (p1, p2, t, a)
+        prev_hash: Hash stocké de la transaction hachée précédente ("0" pour la première)
+    Retourne: Hash en hexadécimal
+    """
+    return sha256(f"{tx['p1']}|{tx['p2']}|{tx['t']}|{tx['a']}|{prev_hash}".encode("utf-8")).hexdigest()
+
+
+def verify_chunk(prev_hash: str, chunk: list) -> list:
+    """
+    Vérifie une fenêtre contiguë de la chaîne.
+    Paramètres:
+        prev_hash: Hash stocké de la dernière transaction hachée avant la fenêtre ("0" au début)
+        chunk: Transactions de la fenêtre, dans l'ordre chronologique
+    Retourne: Liste des transactions invalides de la fenêtre ({"id", "reason", ...})
+    """
+    invalid = []
+    for tx in chunk:
+        if "h" not in tx:
+            invalid.append({"id": tx.get("id"), "reason": "Transaction v1 sans hash"})
+            continue
+        if not _chain_ready(tx):
+            invalid.append({"id": tx.get("id"), "reason": "Champs manquants pour le calcul du hash"})
+            continue
+        computed = chain_hash(tx, prev_hash)
+        if computed != tx["h"]:
+            invalid.append({
+                "id": tx.get("id"),
+                "reason": "Hash invalide ou chaîne cassée",
+                "computed_hash": computed,
+                "stored_hash": tx["h"],
+                "expected_prev_hash": prev_hash,
+            })
+        prev_hash = tx["h"]  # Chaîne suivie sur les hashs stockés, comme /verify
+    return invalid
+
+
+def verify_chain(sorted_txs: list) -> list:
+    """
+    Vérifie toute la chaîne, en parallèle (une fenêtre par processeur) si elle est longue.
+    Le hash précédent de chaque fenêtre est lu en un passage séquentiel (sans calcul de hash).
+    Paramètre: sorted_txs - Toutes les transactions, dans l'ordre chronologique
+    Retourne: Liste des transactions invalides, dans l'ordre chronologique
+    """
+    cpus = os.cpu_count() or 1
+    if len(sorted_txs) < POOL_MIN or cpus < 2:
+        return verify_chunk("0", sorted_txs)
+
+    size = -(-len(sorted_txs) // cpus)  # Division arrondie au supérieur
+    chunks = [sorted_txs[i:i + size] for i in range(0, len(sorted_txs), size)]
+    prevs = []
+    prev_hash = "0"
+    for chunk in chunks:
+        prevs.append(prev_hash)
+        for tx in chunk:
+            if _chain_ready(tx):
+                prev_hash = tx["h"]
+
+    with ProcessPoolExecutor(max_workers=cpus) as pool:
+        return [inv for part in pool.map(verify_chunk, prevs, chunks) for inv in part]
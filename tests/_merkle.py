@@ -0,0 +1,91 @@
+"""
+Arbre de Merkle côté client, pour les scripts de test et d'attaque.
+
+Même construction que le serveur (app.py, GET /merkle) : les racines calculées ici sont donc
+directement comparables à celle renvoyée par l'API.
+- Feuille = SHA-256(0x00 | h), où h est le hash chaîné de la transaction (dans l'ordre du fichier)
+- Nœud interne = SHA-256(0x01 | gauche | droite)
+- Un nœud sans voisin (dernier d'un niveau de taille impaire) remonte tel quel
+"""
+
+from hashlib import sha256
+
+
+def merkle_leaf(h: str) -> bytes:
+    """
+    Calcule la feuille de l'arbre pour le hash chaîné d'une transaction.
+    Paramètre: h - Hash chaîné de la transaction (hexadécimal)
+    Retourne: Feuille (32 octets)
+    """
+    # Formaté comme _merkle_leaf (app.py) : un hash nul ou non textuel (fichier modifié) donne la même feuille
+    return sha256(b"\x00" + f"{h}".encode("utf-8")).digest()
+
+
+def merkle_leaves(txs: list) -> list:
+    """
+    Calcule les feuilles de toutes les transactions, dans l'ordre du fichier.
+    Paramètre: txs - Liste des transactions (une transaction sans hash donne la feuille de "")
+    Retourne: Liste des feuilles
+    """
+    return [merkle_leaf(tx.get("h", "")) for tx in txs]
+
+
+def _parents(row: list) -> list:
+    """
+    Calcule le niveau supérieur de l'arbre à partir d'un niveau.
+    Paramètre: row - Nœuds d'un niveau
+    Retourne: Nœuds du niveau supérieur
+    """
+    parents = [sha256(b"\x01" + row[i] + row[i + 1]).digest() for i in range(0, len(row) - 1, 2)]
+    if len(row) % 2:  # Dernier nœud sans voisin : remonte tel quel
+        parents.append(row[-1])
+    return parents
+
+
+def merkle_root(leaves: list) -> bytes:
+    """
+    Calcule la racine de l'arbre (O(N) hashs, sans garder les niveaux intermédiaires).
+    Paramètre: leaves - Feuilles (voir merkle_leaves)
+    Retourne: Racine (32 octets), ou b"" si aucune feuille
+    """
+    row = list(leaves)
+    if not row:
+        return b""
+    while len(row) > 1:
+        row = _parents(row)
+    return row[0]
+
+
+def merkle_proof(leaves: list, index: int) -> list:
+    """
+    Construit la preuve d'appartenance d'une feuille (voisins sur le chemin jusqu'à la racine).
+    Paramètres:
+        leaves: Feuilles (voir merkle_leaves)
+        index: Position de la feuille
+    Retourne: Liste de {"side": "left"|"right", "hash": voisin en hexadécimal}, même format que GET /merkle/proof/<id>
+    """
+    proof = []
+    row = list(leaves)
+    while len(row) > 1:
+        sibling = index ^ 1  # Voisin : même parent, autre côté
+        if sibling < len(row):  # Pas de voisin : le nœud remonte tel quel, rien à ajouter
+            proof.append({"side": "left" if sibling < index else "right", "hash": row[sibling].hex()})
+        row = _parents(row)
+        index //= 2
+    return proof
+
+
+def root_from_proof(h: str, proof: list) -> bytes:
+    """
+    Recalcule la racine à partir du hash d'une transaction et de sa preuve (O(log N) hashs).
+    Paramètres:
+        h: Hash chaîné de la transaction
+        proof: Preuve d'appartenance (voir merkle_proof)
+    Retourne: Racine obtenue (32 octets), à comparer avec la racine attendue
+    """
+    node = merkle_leaf(h)
+    for step in proof:
+        sibling = bytes.fromhex(step["hash"])
+        pair = sibling + node if step["side"] == "left" else node + sibling
+        node = sha256(b"\x01" + pair).digest()
+    return node
@@ -5,13 +5,23 @@ Ce script simule une attaque où un attaquant modifie directement
 le fichier de données pour changer le montant d'une transaction.
 """
 
-import json
+import orjson  # Lecture/écriture JSON rapide (implémenté en C/Rust)
 from pathlib import Path
 
+from _atomic import atomic_write  # Écriture atomique (fichier temporaire + os.replace)
+
 # Chemin vers le fichier de transactions
 TX_FILE = Path("data/tx.json")
 
 
+def format_transactions(txs):
+    """
+    Construit l'affichage de toutes les transactions en une seule chaîne (une ligne par transaction),
+    pour un seul appel à print au lieu d'un appel par transaction.
+    """
+    return "\n".join(f"      ID {tx['id']}: {tx['p1']} -> {tx['p2']}, montant = {tx['a']}" for tx in txs)
+
+
 def attack_change_amount():
     """
     Simule l'attaque : modifie directement le montant d'une transaction
@@ -21,8 +31,7 @@ def attack_change_amount():
     
     # 1. Lire les transactions actuelles
     print("1. Lecture des transactions actuelles...")
-    with open(TX_FILE, "r", encoding="utf-8") as f:
-        txs = json.load(f)
+    txs = orjson.loads(TX_FILE.read_bytes())
     
     if not txs:
         print("   ❌ Aucune transaction trouvée. Créez d'abord des transactions via l'API.")
@@ -30,8 +39,7 @@ def attack_change_amount():
     
     print(f"   ✓ {len(txs)} transaction(s) trouvée(s)")
     print("\n   Transactions avant attaque :")
-    for tx in txs:
-        print(f"      ID {tx['id']}: {tx['p1']} -> {tx['p2']}, montant = {tx['a']}")
+    print(format_transactions(txs))
     
     # 2. Choisir la première transaction et modifier son montant
     target_tx = txs[0]
@@ -46,16 +54,15 @@ def attack_change_amount():
     
     # 3. Sauvegarder le fichier modifié
     print("\n3. Sauvegarde du fichier modifié...")
-    with open(TX_FILE, "w", encoding="utf-8") as f:
-        json.dump(txs, f, indent=2, ensure_ascii=False)
+    # Le fichier modifié reste en place : même mise en forme (indentation 2) que celle écrite par l'application
+    atomic_write(TX_FILE, orjson.dumps(txs, option=orjson.OPT_INDENT_2))
     print("   ✓ Fichier modifié et sauvegardé")
     
     # 4. Vérifier que le système ne détecte rien
     print("\n4. Vérification : le système ne détecte aucune anomalie")
     print("   (Aucun mécanisme d'intégrité en v1)")
     print("\n   Transactions après attaque :")
-    for tx in txs:
-        print(f"      ID {tx['id']}: {tx['p1']} -> {tx['p2']}, montant = {tx['a']}")
+    print(format_transactions(txs))
     
     # 5. Calculer l'impact sur les soldes
     print("\n5. Impact sur les soldes :")
@@ -65,8 +72,7 @@ def attack_change_amount():
         balances[p1] = balances.get(p1, 0) - a
         balances[p2] = balances.get(p2, 0) + a
     
-    for person, balance in balances.items():
-        print(f"   {person}: {balance:+d}")
+    print("\n".join(f"   {person}: {balance:+d}" for person, balance in balances.items()))
     
     print("\n=== CONCLUSION ===")
     print("✓ L'attaque a réussi : le montant a été modifié sans détection")
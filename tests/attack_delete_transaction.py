@@ -5,14 +5,35 @@ Ce script simule une attaque où un attaquant supprime directement
 une transaction du fichier de données.
 """
 
-import json
+import orjson  # Lecture/écriture JSON rapide (implémenté en C/Rust)
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 
+from _atomic import atomic_write  # Écriture atomique (fichier temporaire + os.replace)
+from _merkle import merkle_leaves, merkle_root  # Arbre de Merkle côté client (même construction que le serveur)
+
 # Configuration
 TX_FILE = Path("data/tx.json")
 API_BASE_URL = "http://localhost:5000"
 
+# Session HTTP persistante : une seule connexion keep-alive réutilisée pour tous les appels à l'API
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+
+# Texte de conclusion (statique), affiché en un seul appel à print
+CONCLUSION = """
+=== CONCLUSION ===
+✓ L'attaque de suppression a réussi : la transaction a été supprimée
+✓ Le système v2 ne peut PAS détecter les suppressions
+  → Chaque transaction a un hash indépendant
+  → Supprimer une transaction ne casse pas les hashs des autres
+✓ La racine de Merkle (tests/_merkle.py), elle, change : un client qui l'a mémorisée détecte la suppression
+✓ Les soldes sont maintenant incorrects (double dépense possible)
+
+⚠️  RISQUE : La suppression peut entraîner la double dépense
+   (une transaction peut être dépensée deux fois si elle est supprimée)"""
+
 
 def attack_delete_transaction():
     """
@@ -24,12 +45,13 @@ def attack_delete_transaction():
     # 1. Vérifier l'état initial
     print("1. État initial des transactions...")
     try:
-        response = requests.get(f"{API_BASE_URL}/transactions")
+        response = SESSION.get(f"{API_BASE_URL}/transactions")
         if response.status_code == 200:
-            txs = response.json()
+            # Décodage avec orjson (liste complète, taille O(N)) plutôt que response.json() (module json)
+            txs = orjson.loads(response.content)
             print(f"   ✓ {len(txs)} transaction(s) trouvée(s)")
-            for tx in txs:
-                print(f"      ID {tx['id']}: {tx['p1']} -> {tx['p2']}, montant = {tx['a']}")
+            # Une ligne par transaction, affichées en un seul appel à print
+            print("\n".join(f"      ID {tx['id']}: {tx['p1']} -> {tx['p2']}, montant = {tx['a']}" for tx in txs))
         else:
             print(f"   ❌ Erreur API: {response.status_code}")
             return
@@ -41,7 +63,7 @@ def attack_delete_transaction():
     # 2. Vérifier l'intégrité initiale
     print("\n2. Vérification de l'intégrité initiale...")
     try:
-        response = requests.get(f"{API_BASE_URL}/verify")
+        response = SESSION.get(f"{API_BASE_URL}/verify", params={"summary": 1})
         if response.status_code == 200:
             data = response.json()
             print(f"   Status: {data['status']}")
@@ -51,8 +73,11 @@ def attack_delete_transaction():
     
     # 3. Lire le fichier et sauvegarder une copie
     print("\n3. Lecture du fichier de transactions...")
-    with open(TX_FILE, "r", encoding="utf-8") as f:
-        txs = json.load(f)
+    # Relecture du fichier nécessaire : /transactions renvoie l'ordre chronologique, pas l'ordre du fichier,
+    # or l'attaque modifie le fichier tel qu'il est stocké.
+    # Copie exacte du fichier (bytes) : la restauration le réécrit tel quel, sans ré-encoder le JSON
+    original_bytes = TX_FILE.read_bytes()
+    txs = orjson.loads(original_bytes)
     
     if len(txs) < 2:
         print("   ⚠️  Il faut au moins 2 transactions pour tester la suppression.")
@@ -72,9 +97,12 @@ def attack_delete_transaction():
     print(f"   ✓ Transaction cible: ID {target_tx['id']}")
     print(f"      {target_tx['p1']} -> {target_tx['p2']}, montant = {target_tx['a']}")
     
-    # Sauvegarder la transaction pour restauration
-    saved_tx = target_tx.copy()
-    saved_txs = txs.copy()
+    # Racine de Merkle du registre intact (ce qu'un client aurait mémorisé avant l'attaque)
+    root_before = merkle_root(merkle_leaves(txs))
+    print(f"   Racine de Merkle avant attaque: {root_before.hex()[:16]}...")
+    
+    # Garder la transaction supprimée pour le calcul des soldes (la restauration utilise original_bytes)
+    saved_tx = target_tx
     
     # 4. Supprimer la transaction (attaque)
     print(f"\n4. ATTAQUE : Suppression de la transaction ID {target_tx['id']}...")
@@ -83,14 +111,13 @@ def attack_delete_transaction():
     print(f"   Transactions restantes: {len(txs)}")
     
     # Sauvegarder le fichier modifié
-    with open(TX_FILE, "w", encoding="utf-8") as f:
-        json.dump(txs, f, indent=2, ensure_ascii=False)
+    atomic_write(TX_FILE, orjson.dumps(txs, option=orjson.OPT_APPEND_NEWLINE))  # JSON compact, UTF-8
     print("   ✓ Fichier modifié et sauvegardé")
     
     # 5. Vérifier l'intégrité après suppression
     print("\n5. Vérification de l'intégrité après suppression...")
     try:
-        response = requests.get(f"{API_BASE_URL}/verify")
+        response = SESSION.get(f"{API_BASE_URL}/verify", params={"summary": 1})
         if response.status_code == 200:
             data = response.json()
             print(f"   Status: {data['status']}")
@@ -107,47 +134,52 @@ def attack_delete_transaction():
     except requests.exceptions.ConnectionError:
         print("   ❌ Impossible de se connecter à l'API.")
     
+    # Contrairement aux hashs indépendants, la racine de Merkle dépend de toutes les transactions
+    root_after = merkle_root(merkle_leaves(txs))
+    print(f"\n   Racine de Merkle après attaque: {root_after.hex()[:16]}...")
+    if root_after != root_before:
+        print("   ✅ La racine de Merkle a changé : la suppression est détectée par comparaison des racines")
+    else:
+        print("   ❌ ERREUR : la racine de Merkle n'a pas changé !")
+    
     # 6. Vérifier l'impact sur les soldes
     print("\n6. Impact sur les soldes...")
+    lines = []  # Rapport accumulé puis affiché en un seul appel (au lieu d'un print par personne)
     try:
-        # Calculer les soldes avant et après
-        balances_before = {}
-        for tx in saved_txs:
-            p1, p2, a = tx["p1"], tx["p2"], tx["a"]
-            balances_before[p1] = balances_before.get(p1, 0) - a
-            balances_before[p2] = balances_before.get(p2, 0) + a
-        
+        # Calculer les soldes après suppression (un seul passage sur les transactions restantes)
         balances_after = {}
         for tx in txs:
             p1, p2, a = tx["p1"], tx["p2"], tx["a"]
             balances_after[p1] = balances_after.get(p1, 0) - a
             balances_after[p2] = balances_after.get(p2, 0) + a
-        
-        print("   Soldes avant suppression:")
-        for person in set(list(balances_before.keys()) + list(balances_after.keys())):
+
+        # Les soldes avant ne diffèrent que par la transaction supprimée : on la ré-applique (O(1))
+        balances_before = dict(balances_after)
+        p1, p2, a = saved_tx["p1"], saved_tx["p2"], saved_tx["a"]
+        balances_before[p1] = balances_before.get(p1, 0) - a
+        balances_before[p2] = balances_before.get(p2, 0) + a
+
+        lines.append("   Soldes avant suppression:")
+        # Toutes les personnes apparaissent déjà dans balances_before (pas besoin d'union)
+        for person in balances_before:
             before = balances_before.get(person, 0)
             after = balances_after.get(person, 0)
             if before != after:
-                print(f"      {person}: {before} → {after} (différence: {after - before:+d}) ⚠️")
+                lines.append(f"      {person}: {before} → {after} (différence: {after - before:+d}) ⚠️")
             else:
-                print(f"      {person}: {before}")
+                lines.append(f"      {person}: {before}")
+        print("\n".join(lines))
     except Exception as e:
-        print(f"   Erreur: {e}")
+        # Afficher ce qui a déjà été calculé avant l'erreur
+        lines.append(f"   Erreur: {e}")
+        print("\n".join(lines))
     
     # 7. Restaurer le fichier original
     print("\n7. Restauration du fichier original...")
-    with open(TX_FILE, "w", encoding="utf-8") as f:
-        json.dump(saved_txs, f, indent=2, ensure_ascii=False)
+    atomic_write(TX_FILE, original_bytes)  # Contenu d'origine, à l'octet près
     print("   ✓ Fichier restauré")
     
-    print("\n=== CONCLUSION ===")
-    print("✓ L'attaque de suppression a réussi : la transaction a été supprimée")
-    print("✓ Le système v2 ne peut PAS détecter les suppressions")
-    print("  → Chaque transaction a un hash indépendant")
-    print("  → Supprimer une transaction ne casse pas les hashs des autres")
-    print("✓ Les soldes sont maintenant incorrects (double dépense possible)")
-    print("\n⚠️  RISQUE : La suppression peut entraîner la double dépense")
-    print("   (une transaction peut être dépensée deux fois si elle est supprimée)")
+    print(CONCLUSION)
 
 
 if __name__ == "__main__":
@@ -5,23 +5,46 @@ Ce script simule une attaque où un attaquant insère une transaction frauduleus
 dans le fichier de données (ex: une transaction vers son propre compte).
 """
 
-import json
-import hashlib
+import orjson  # Lecture/écriture JSON rapide (implémenté en C/Rust)
+from hashlib import sha256  # Liaison directe (évite la résolution hashlib.sha256 à chaque appel)
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 from datetime import datetime, timezone
 
+from _atomic import atomic_write  # Écriture atomique (fichier temporaire + os.replace)
+from _chain import verify_chain  # Vérification du hash chaîné côté client (parallèle si la chaîne est longue)
+
 # Configuration
 TX_FILE = Path("data/tx.json")
 API_BASE_URL = "http://localhost:5000"
 
+# Session HTTP persistante : une seule connexion keep-alive réutilisée pour tous les appels à l'API
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+
+# Texte de conclusion (statique), affiché en un seul appel à print
+CONCLUSION = """
+=== CONCLUSION ===
+✓ L'attaque d'insertion a été tentée
+✓ Le système v3 avec hash chaîné devrait détecter cette attaque
+  car les transactions suivantes auront un hash qui ne correspond pas
+  au hash précédent attendu (la transaction frauduleuse a cassé la chaîne)"""
+
+def normalize_iso(t: str) -> str:
+    """
+    Normalise un timestamp ISO 8601 (suffixe "Z" accepté) sous la forme produite par isoformat().
+    Un seul appel à fromisoformat, après remplacement de "Z" par "+00:00".
+    """
+    return datetime.fromisoformat(t.replace("Z", "+00:00")).isoformat()
+
 
 def compute_hash(p1: str, p2: str, t: str, a: float, prev_hash: str = "0") -> str:
     """
     Calcule le hash SHA-256 chaîné d'une transaction (v3).
     """
-    data = f"{p1}|{p2}|{t}|{a}|{prev_hash}"
-    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+    # Message construit en une seule f-string puis encodé une fois (plus rapide qu'un join de bytes)
+    return sha256(f"{p1}|{p2}|{t}|{a}|{prev_hash}".encode("utf-8")).hexdigest()
 
 
 def attack_insert_transaction():
@@ -33,9 +56,10 @@ def attack_insert_transaction():
     # 1. Vérifier l'état initial
     print("1. État initial des transactions...")
     try:
-        response = requests.get(f"{API_BASE_URL}/transactions")
+        response = SESSION.get(f"{API_BASE_URL}/transactions")
         if response.status_code == 200:
-            txs = response.json()
+            # Décodage avec orjson (liste complète, taille O(N)) plutôt que response.json() (module json)
+            txs = orjson.loads(response.content)
             print(f"   ✓ {len(txs)} transaction(s) trouvée(s)")
             if len(txs) < 2:
                 print("   ⚠️  Il faut au moins 2 transactions pour tester l'insertion")
@@ -53,7 +77,7 @@ def attack_insert_transaction():
     # 2. Vérifier l'intégrité initiale
     print("\n2. Vérification de l'intégrité initiale...")
     try:
-        response = requests.get(f"{API_BASE_URL}/verify")
+        response = SESSION.get(f"{API_BASE_URL}/verify", params={"summary": 1})
         if response.status_code == 200:
             data = response.json()
             print(f"   Status: {data['status']}")
@@ -65,67 +89,70 @@ def attack_insert_transaction():
     
     # 3. Lire le fichier
     print("\n3. Lecture du fichier de transactions...")
-    with open(TX_FILE, "r", encoding="utf-8") as f:
-        txs = json.load(f)
+    # Relecture du fichier nécessaire : /transactions renvoie l'ordre chronologique, pas l'ordre du fichier,
+    # or l'attaque modifie le fichier tel qu'il est stocké.
+    # Copie exacte du fichier (bytes) : la restauration le réécrit tel quel, sans ré-encoder le JSON
+    original_bytes = TX_FILE.read_bytes()
+    txs = orjson.loads(original_bytes)
     
     if len(txs) < 2:
         print("   ⚠️  Il faut au moins 2 transactions")
         return
     
-    # Trier par timestamp
-    sorted_txs = sorted(txs, key=lambda tx: tx.get("t", ""))
-    
-    # Sauvegarder pour restauration
-    saved_txs = txs.copy()
+    # Un seul passage sur la liste : transaction la plus ancienne (et sa position) + plus grand ID.
+    # Remplace le tri complet par timestamp et les deux parcours supplémentaires (max, recherche d'index).
+    first_index = 0
+    first_t = txs[0].get("t", "")
+    max_id = 0
+    for i, tx in enumerate(txs):
+        t = tx.get("t", "")
+        if t < first_t:  # Strictement inférieur : à égalité, la première rencontrée est gardée (comme un tri stable)
+            first_index, first_t = i, t
+        tx_id = tx.get("id", 0)
+        if tx_id > max_id:
+            max_id = tx_id
     
     # 4. Créer une transaction frauduleuse
     print("\n4. ATTAQUE : Insertion d'une transaction frauduleuse...")
     
     # L'attaquant veut insérer une transaction qui lui donne de l'argent
     attacker = "attacker"
-    victim = sorted_txs[0]["p1"]  # Prendre l'expéditeur de la première transaction
-    
     # Insérer la transaction entre la première et la deuxième
     # Utiliser le hash de la première transaction comme prev_hash
-    first_tx = sorted_txs[0]
+    first_tx = txs[first_index]
+    victim = first_tx["p1"]  # Prendre l'expéditeur de la première transaction
     prev_hash = first_tx.get("h", "0")
     
+    # Timestamp de la transaction frauduleuse : analysé une seule fois (first_t vient du passage ci-dessus), réutilisé pour "t" et pour le hash
+    t_str = normalize_iso(first_t)
+    
     # Créer une transaction frauduleuse
     fake_tx = {
-        "id": max(tx.get("id", 0) for tx in txs) + 1000,  # ID élevé pour éviter les conflits
+        "id": max_id + 1000,  # ID élevé pour éviter les conflits
         "p1": victim,
         "p2": attacker,
         "a": 1000,  # Montant frauduleux
-        "t": (datetime.fromisoformat(first_tx["t"].replace("Z", "+00:00")) 
-              if "Z" in first_tx["t"] 
-              else datetime.fromisoformat(first_tx["t"])).isoformat(),
-        "h": compute_hash(victim, attacker, 
-                         (datetime.fromisoformat(first_tx["t"].replace("Z", "+00:00")) 
-                          if "Z" in first_tx["t"] 
-                          else datetime.fromisoformat(first_tx["t"])).isoformat(),
-                         1000, prev_hash)
+        "t": t_str,
+        "h": compute_hash(victim, attacker, t_str, 1000, prev_hash)
     }
     
     print(f"   Transaction frauduleuse créée:")
     print(f"      {fake_tx['p1']} -> {fake_tx['p2']}, montant = {fake_tx['a']}")
     print(f"      Hash calculé avec prev_hash = {prev_hash[:16]}...")
     
-    # Insérer la transaction dans la liste (après la première)
-    # Trouver l'index de la première transaction dans la liste originale
-    first_index = next(i for i, tx in enumerate(txs) if tx.get("id") == first_tx.get("id"))
+    # Insérer la transaction dans la liste (après la première, dont la position est déjà connue)
     txs.insert(first_index + 1, fake_tx)
     
     print(f"   ✓ Transaction insérée à la position {first_index + 1}")
     
     # Sauvegarder le fichier modifié
-    with open(TX_FILE, "w", encoding="utf-8") as f:
-        json.dump(txs, f, indent=2, ensure_ascii=False)
+    atomic_write(TX_FILE, orjson.dumps(txs, option=orjson.OPT_APPEND_NEWLINE))  # JSON compact, UTF-8
     print("   ✓ Fichier modifié et sauvegardé")
     
     # 5. Vérifier l'intégrité après insertion
     print("\n5. Vérification de l'intégrité après insertion...")
     try:
-        response = requests.get(f"{API_BASE_URL}/verify")
+        response = SESSION.get(f"{API_BASE_URL}/verify")
         if response.status_code == 200:
             data = response.json()
             print(f"   Status: {data['status']}")
@@ -147,10 +174,16 @@ def attack_insert_transaction():
     except requests.exceptions.ConnectionError:
         print("   ❌ Impossible de se connecter à l'API.")
     
+    # Même vérification recalculée côté client, directement sur le fichier modifié
+    local_invalid = verify_chain(sorted(txs, key=lambda tx: tx.get("t", "")))
+    print(f"\n   Vérification locale de la chaîne: {len(local_invalid)} transaction(s) invalide(s)")
+    if local_invalid:
+        print(f"      Première transaction invalide: ID {local_invalid[0]['id']} ({local_invalid[0]['reason']})")
+    
     # 6. Vérifier l'impact sur les soldes
     print("\n6. Impact sur les soldes...")
     try:
-        response = requests.get(f"{API_BASE_URL}/balance/{attacker}")
+        response = SESSION.get(f"{API_BASE_URL}/balance/{attacker}")
         if response.status_code == 200:
             balance_data = response.json()
             print(f"   Solde de l'attaquant ({attacker}): {balance_data.get('balance', 0)}")
@@ -161,15 +194,10 @@ def attack_insert_transaction():
     
     # 7. Restaurer le fichier original
     print("\n7. Restauration du fichier original...")
-    with open(TX_FILE, "w", encoding="utf-8") as f:
-        json.dump(saved_txs, f, indent=2, ensure_ascii=False)
+    atomic_write(TX_FILE, original_bytes)  # Contenu d'origine, à l'octet près
     print("   ✓ Fichier restauré")
     
-    print("\n=== CONCLUSION ===")
-    print("✓ L'attaque d'insertion a été tentée")
-    print("✓ Le système v3 avec hash chaîné devrait détecter cette attaque")
-    print("  car les transactions suivantes auront un hash qui ne correspond pas")
-    print("  au hash précédent attendu (la transaction frauduleuse a cassé la chaîne)")
+    print(CONCLUSION)
 
 
 if __name__ == "__main__":
@@ -5,9 +5,10 @@ Ce script supprime les anciennes transactions et permet de repartir
 avec un système v3 propre.
 """
 
-import json
 from pathlib import Path
 
+from _atomic import atomic_write  # Écriture atomique (fichier temporaire + os.replace)
+
 TX_FILE = Path("data/tx.json")
 
 
@@ -28,15 +29,11 @@ def migrate_to_v3():
     # Sauvegarder une copie de sauvegarde
     backup_file = TX_FILE.parent / "tx.json.backup"
     if TX_FILE.exists():
-        with open(TX_FILE, "r", encoding="utf-8") as f:
-            old_data = f.read()
-        with open(backup_file, "w", encoding="utf-8") as f:
-            f.write(old_data)
+        atomic_write(backup_file, TX_FILE.read_bytes())  # Copie exacte (bytes)
         print(f"\n✓ Sauvegarde créée : {backup_file}")
     
-    # Réinitialiser le fichier
-    with open(TX_FILE, "w", encoding="utf-8") as f:
-        json.dump([], f, indent=2, ensure_ascii=False)
+    # Réinitialiser le fichier (remplacement atomique : un serveur démarré ne lit jamais un fichier vide ou partiel)
+    atomic_write(TX_FILE, b"[]")
     
     print("✓ Fichier de transactions réinitialisé")
     print("\nVous pouvez maintenant créer de nouvelles transactions via l'API.")
@@ -5,14 +5,21 @@ est maintenant détectée grâce au système de hash (v2).
 Ce script simule l'attaque puis vérifie que /verify la détecte.
 """
 
-import json
+import orjson  # Lecture/écriture JSON rapide (implémenté en C/Rust)
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 
+from _atomic import atomic_write, restoring  # Écriture atomique (fichier temporaire + os.replace)
+
 # Configuration
 TX_FILE = Path("data/tx.json")
 API_BASE_URL = "http://localhost:5000"
 
+# Session HTTP persistante : une seule connexion keep-alive réutilisée pour tous les appels à l'API
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+
 
 def test_attack_detection():
     """
@@ -23,7 +30,7 @@ def test_attack_detection():
     # 1. Vérifier l'état initial
     print("1. Vérification de l'intégrité initiale...")
     try:
-        response = requests.get(f"{API_BASE_URL}/verify")
+        response = SESSION.get(f"{API_BASE_URL}/verify", params={"summary": 1})
         if response.status_code == 200:
             data = response.json()
             print(f"   Status: {data['status']}")
@@ -40,8 +47,9 @@ def test_attack_detection():
     
     # 2. Lire les transactions
     print("\n2. Lecture des transactions...")
-    with open(TX_FILE, "r", encoding="utf-8") as f:
-        txs = json.load(f)
+    # Copie exacte du fichier (bytes) : la restauration le réécrit tel quel, sans ré-encoder le JSON
+    original_bytes = TX_FILE.read_bytes()
+    txs = orjson.loads(original_bytes)
     
     if not txs:
         print("   ❌ Aucune transaction trouvée.")
@@ -63,8 +71,7 @@ def test_attack_detection():
     print(f"      {target_tx['p1']} -> {target_tx['p2']}, montant = {target_tx['a']}")
     print(f"      Hash stocké: {target_tx['h'][:16]}...")
     
-    # 3. Sauvegarder le hash original pour restauration
-    original_hash = target_tx["h"]
+    # 3. Montant original (pour l'affichage ; la restauration utilise original_bytes)
     original_amount = target_tx["a"]
     
     # 4. Modifier le montant (attaque)
@@ -74,59 +81,56 @@ def test_attack_detection():
     print(f"   Montant original: {original_amount}")
     print(f"   Nouveau montant: {new_amount}")
     
-    # Sauvegarder le fichier modifié
-    with open(TX_FILE, "w", encoding="utf-8") as f:
-        json.dump(txs, f, indent=2, ensure_ascii=False)
-    print("   ✓ Fichier modifié et sauvegardé")
-    
-    # 5. Vérifier que /verify détecte la corruption
-    print("\n4. Vérification de l'intégrité après attaque...")
-    try:
-        response = requests.get(f"{API_BASE_URL}/verify")
-        if response.status_code == 200:
-            data = response.json()
-            print(f"   Status: {data['status']}")
-            print(f"   Valid: {data['valid']}")
-            print(f"   Transactions valides: {data['valid_count']}/{data['total_transactions']}")
-            print(f"   Transactions invalides: {data['invalid_count']}")
+    # 6. (restauration) Le fichier original est réécrit à la sortie du bloc with, même si la vérification
+    #    lève une exception : les données ne restent jamais corrompues
+    with restoring(TX_FILE, original_bytes):  # Contenu d'origine, à l'octet près (un seul appel d'écriture)
+        # Sauvegarder le fichier modifié
+        atomic_write(TX_FILE, orjson.dumps(txs, option=orjson.OPT_APPEND_NEWLINE))  # JSON compact, UTF-8
+        print("   ✓ Fichier modifié et sauvegardé")
+        
+        # 5. Vérifier que /verify détecte la corruption
+        print("\n4. Vérification de l'intégrité après attaque...")
+        try:
+            response = SESSION.get(f"{API_BASE_URL}/verify")
+            if response.status_code == 200:
+                data = response.json()
+                print(f"   Status: {data['status']}")
+                print(f"   Valid: {data['valid']}")
+                print(f"   Transactions valides: {data['valid_count']}/{data['total_transactions']}")
+                print(f"   Transactions invalides: {data['invalid_count']}")
             
-            # Filtrer pour trouver notre transaction attaquée
-            attacked_tx_found = False
-            for invalid in data['invalid_transactions']:
-                if invalid['id'] == target_tx['id'] and 'computed_hash' in invalid:
-                    attacked_tx_found = True
-                    print("\n   ✅ ATTAQUE DÉTECTÉE !")
-                    print(f"\n   Transaction attaquée (ID {invalid['id']}):")
-                    print(f"      Raison: {invalid['reason']}")
-                    print(f"      Hash calculé: {invalid['computed_hash'][:16]}...")
-                    print(f"      Hash stocké:  {invalid['stored_hash'][:16]}...")
-                    break
+                # Filtrer pour trouver notre transaction attaquée
+                attacked_tx_found = False
+                for invalid in data['invalid_transactions']:
+                    if invalid['id'] == target_tx['id'] and 'computed_hash' in invalid:
+                        attacked_tx_found = True
+                        print("\n   ✅ ATTAQUE DÉTECTÉE !")
+                        print(f"\n   Transaction attaquée (ID {invalid['id']}):")
+                        print(f"      Raison: {invalid['reason']}")
+                        print(f"      Hash calculé: {invalid['computed_hash'][:16]}...")
+                        print(f"      Hash stocké:  {invalid['stored_hash'][:16]}...")
+                        break
             
-            if not attacked_tx_found:
-                print("\n   ❌ ERREUR : L'attaque sur la transaction ID {target_tx['id']} n'a pas été détectée !")
+                if not attacked_tx_found:
+                    print("\n   ❌ ERREUR : L'attaque sur la transaction ID {target_tx['id']} n'a pas été détectée !")
             
-            # Afficher les autres transactions invalides (v1 sans hash, etc.)
-            other_invalid = [inv for inv in data['invalid_transactions'] 
-                           if inv['id'] != target_tx['id']]
-            if other_invalid:
-                print(f"\n   Note: {len(other_invalid)} autre(s) transaction(s) invalide(s) (v1 sans hash, etc.)")
-        else:
-            print(f"   ❌ Erreur API: {response.status_code}")
-    except requests.exceptions.ConnectionError:
-        print("   ❌ Impossible de se connecter à l'API.")
-    
-    # 6. Restaurer le fichier original (pour ne pas laisser les données corrompues)
-    print("\n5. Restauration du fichier original...")
-    target_tx["a"] = original_amount
-    target_tx["h"] = original_hash
-    with open(TX_FILE, "w", encoding="utf-8") as f:
-        json.dump(txs, f, indent=2, ensure_ascii=False)
+                # Afficher les autres transactions invalides (v1 sans hash, etc.)
+                other_invalid = [inv for inv in data['invalid_transactions'] 
+                               if inv['id'] != target_tx['id']]
+                if other_invalid:
+                    print(f"\n   Note: {len(other_invalid)} autre(s) transaction(s) invalide(s) (v1 sans hash, etc.)")
+            else:
+                print(f"   ❌ Erreur API: {response.status_code}")
+        except requests.exceptions.ConnectionError:
+            print("   ❌ Impossible de se connecter à l'API.")
+        
+        print("\n5. Restauration du fichier original...")
     print("   ✓ Fichier restauré")
     
     # 7. Vérifier que tout est revenu à la normale
     print("\n6. Vérification finale...")
     try:
-        response = requests.get(f"{API_BASE_URL}/verify")
+        response = SESSION.get(f"{API_BASE_URL}/verify", params={"summary": 1})
         if response.status_code == 200:
             data = response.json()
             if data['status'] == 'OK':
@@ -5,177 +5,341 @@ ne fonctionnent plus avec le hash chaîné (v3).
 Ce script teste :
 1. Attaque de modification de montant (exercice 4)
 2. Attaque de suppression (exercice 8)
+3. Hash stocké remplacé par une valeur non textuelle (/verify doit répondre KO, pas une erreur 500)
+4. Hash stocké mis à null (la cible doit échouer au contrôle du hash, pas passer pour une transaction v1)
+
+Chaque attaque est aussi vérifiée avec l'arbre de Merkle du serveur (GET /merkle, /merkle/proof) :
+preuve de la transaction modifiée (O(log N)) et racine recalculée après la suppression.
 """
 
-import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import orjson  # Lecture/écriture JSON rapide (implémenté en C/Rust)
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 
+from _atomic import atomic_write, restoring  # Écriture atomique (fichier temporaire + os.replace)
+from _chain import chain_hash  # Recalcul du hash chaîné d'une transaction
+from _merkle import merkle_leaves, merkle_root, root_from_proof  # Arbre de Merkle côté client
+
 # Configuration
 TX_FILE = Path("data/tx.json")
 API_BASE_URL = "http://localhost:5000"
 
+# Session HTTP persistante : une seule connexion keep-alive réutilisée pour tous les appels à l'API
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+
 
-def test_modification_attack():
+def _dump(txs):
     """
-    Teste que l'attaque de modification de montant est détectée (v3).
+    Écrit la liste des transactions dans tx.json : JSON encodé d'abord en mémoire (orjson, même
+    mise en forme que l'application), puis écrit en un seul appel.
+    Paramètre: txs - Liste des transactions
+    """
+    atomic_write(TX_FILE, orjson.dumps(txs, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+
+# Dernière réponse de /verify et son ETag : réutilisée telle quelle quand le serveur répond 304
+_last_verify = {"etag": None, "data": None}
+
+
+def _verify():
+    """
+    Appelle GET /verify en requête conditionnelle : l'ETag de la réponse précédente est envoyé dans
+    If-None-Match, et le serveur répond 304 (sans corps ni recalcul) si tx.json et keys.json n'ont pas changé.
+    Retourne: Tuple (code HTTP, rapport) ; un 304 est traité comme un 200 avec le dernier rapport reçu
+    """
+    headers = {"If-None-Match": _last_verify["etag"]} if _last_verify["etag"] else {}
+    response = SESSION.get(f"{API_BASE_URL}/verify", headers=headers)
+    if response.status_code == 304:
+        return 200, _last_verify["data"]
+    if response.status_code != 200:
+        return response.status_code, None
+    _last_verify["etag"] = response.headers.get("ETag")
+    _last_verify["data"] = response.json()
+    return 200, _last_verify["data"]
+
+
+# ===== ATTAQUES =====
+# Chaque attaque modifie la liste des transactions lue dans tx.json ; les étapes communes
+# (état initial, choix de la cible, écriture, vérification) sont dans _run_attack
+
+
+def _mutate_amount(txs, target_tx):
+    """
+    Attaque de modification de montant (exercice 4) : multiplie le montant de la cible par 10.
+    Paramètres:
+        txs: Liste des transactions (modifiée sur place)
+        target_tx: Transaction cible (élément de txs)
+    Retourne: Liste des transactions après l'attaque
     """
-    print("=== TEST 1 : Attaque de modification de montant (v3) ===\n")
-    
-    # 1. Vérifier l'état initial
-    print("1. État initial...")
-    try:
-        response = requests.get(f"{API_BASE_URL}/verify")
-        if response.status_code == 200:
-            data = response.json()
-            print(f"   Status: {data['status']}")
-            print(f"   Transactions valides: {data['valid_count']}/{data['total_transactions']}")
-            if data['status'] != 'OK':
-                print("   ⚠️  Le système n'est pas dans un état valide initialement")
-                return False
-        else:
-            print(f"   ❌ Erreur API: {response.status_code}")
-            return False
-    except requests.exceptions.ConnectionError:
-        print("   ❌ Impossible de se connecter à l'API.")
-        print("   Assurez-vous que le serveur Flask est démarré (python app.py)")
-        return False
-    
-    # 2. Lire les transactions
-    with open(TX_FILE, "r", encoding="utf-8") as f:
-        txs = json.load(f)
-    
-    if len(txs) < 2:
-        print("   ⚠️  Il faut au moins 2 transactions pour tester")
-        return False
-    
-    # Trouver une transaction au milieu (pas la première, pas la dernière)
-    target_tx = None
-    sorted_txs = sorted(txs, key=lambda tx: tx.get("t", ""))
-    if len(sorted_txs) >= 2:
-        target_tx = sorted_txs[1]  # Deuxième transaction
-    
-    if not target_tx or "h" not in target_tx:
-        print("   ⚠️  Transaction cible invalide")
-        return False
-    
-    print(f"   ✓ Transaction cible: ID {target_tx['id']}")
-    print(f"      {target_tx['p1']} -> {target_tx['p2']}, montant = {target_tx['a']}")
-    
-    # Sauvegarder pour restauration
-    saved_tx = target_tx.copy()
-    saved_txs = txs.copy()
-    
-    # 3. Modifier le montant (attaque)
-    print(f"\n2. ATTAQUE : Modification du montant...")
     original_amount = target_tx["a"]
     new_amount = original_amount * 10
     target_tx["a"] = new_amount
     print(f"   Montant: {original_amount} → {new_amount}")
-    
-    with open(TX_FILE, "w", encoding="utf-8") as f:
-        json.dump(txs, f, indent=2, ensure_ascii=False)
-    print("   ✓ Fichier modifié")
-    
-    # 4. Vérifier que l'attaque est détectée
-    print("\n3. Vérification de l'intégrité...")
+    return txs
+
+
+def _mutate_delete(txs, target_tx):
+    """
+    Attaque de suppression (exercice 8) : retire la cible de la liste.
+    Paramètres:
+        txs: Liste des transactions (modifiée sur place)
+        target_tx: Transaction cible (élément de txs)
+    Retourne: Liste des transactions après l'attaque
+    """
+    txs.remove(target_tx)
+    print(f"   Transaction ID {target_tx['id']} supprimée")
+    print(f"   Transactions restantes: {len(txs)}")
+    return txs
+
+
+def _mutate_hash_number(txs, target_tx):
+    """
+    Attaque sur le hash stocké : le remplace par un nombre (tx.json modifié à la main).
+    Paramètres:
+        txs: Liste des transactions (modifiée sur place)
+        target_tx: Transaction cible (élément de txs)
+    Retourne: Liste des transactions après l'attaque
+    """
+    target_tx["h"] = 0
+    print("   Hash stocké remplacé par 0 (nombre)")
+    return txs
+
+
+def _mutate_hash_null(txs, target_tx):
+    """
+    Attaque sur le hash stocké : le met à null (la clé "h" reste présente).
+    Paramètres:
+        txs: Liste des transactions (modifiée sur place)
+        target_tx: Transaction cible (élément de txs)
+    Retourne: Liste des transactions après l'attaque
+    """
+    target_tx["h"] = None
+    print("   Hash stocké mis à null")
+    return txs
+
+
+def _merkle_proof_ref(target_id):
+    """
+    Preuve de Merkle de la cible dans le registre intact (chemin de O(log N) voisins + racine de référence).
+    Paramètre: target_id - Id de la transaction cible
+    Retourne: Réponse de GET /merkle/proof/<id>, ou None si indisponible
+    """
     try:
-        response = requests.get(f"{API_BASE_URL}/verify")
+        response = SESSION.get(f"{API_BASE_URL}/merkle/proof/{target_id}")
         if response.status_code == 200:
-            data = response.json()
-            print(f"   Status: {data['status']}")
-            print(f"   Transactions invalides: {data['invalid_count']}")
-            
-            if data['status'] == 'KO' and data['invalid_count'] > 0:
-                print("\n   ✅ ATTAQUE DÉTECTÉE !")
-                print("   La chaîne de hash est cassée")
-                for invalid in data['invalid_transactions']:
-                    if invalid['id'] == target_tx['id']:
-                        print(f"      Transaction ID {invalid['id']}: {invalid['reason']}")
-                result = True
-            else:
-                print("\n   ❌ ERREUR : L'attaque n'a pas été détectée !")
-                result = False
-        else:
-            result = False
-    except:
-        result = False
-    
-    # 5. Note: La restauration sera effectuée dans main()
-    print("\n4. Note: La restauration sera effectuée après tous les tests\n")
-    
-    return result
+            return response.json()
+    except requests.exceptions.ConnectionError:
+        pass
+    return None
 
 
-def test_deletion_attack():
+def _merkle_proof_check(merkle_ref, target_tx, prev_hash):
     """
-    Teste que l'attaque de suppression est détectée (v3).
+    Vérification locale en O(log N) : seul le hash de la cible est recalculé (à partir du hash stocké
+    de la transaction précédente), puis remonté jusqu'à la racine avec la preuve d'avant l'attaque.
+    Paramètres:
+        merkle_ref: Preuve d'avant l'attaque (voir _merkle_proof_ref)
+        target_tx: Transaction cible après l'attaque
+        prev_hash: Hash stocké de la transaction précédente
+    Retourne: True si la modification est détectée (ou si la preuve est indisponible)
+    """
+    if merkle_ref is None:
+        print("\n   ⚠️  Preuve de Merkle indisponible (GET /merkle/proof)")
+        return True
+    recomputed = chain_hash(target_tx, prev_hash)
+    merkle_root_now = root_from_proof(recomputed, merkle_ref["proof"]).hex()
+    merkle_detected = merkle_root_now != merkle_ref["root"]
+    print(f"\n   Preuve de Merkle ({len(merkle_ref['proof'])} voisin(s)) : "
+          f"{'✅ racine différente, modification détectée' if merkle_detected else '❌ racine identique'}")
+    return merkle_detected
+
+
+def _merkle_root_ref():
+    """
+    Racine de Merkle du registre intact, donnée par le serveur (réponse de taille constante).
+    Retourne: Racine en hexadécimal, ou None si indisponible
     """
-    print("=== TEST 2 : Attaque de suppression (v3) ===\n")
-    
-    # 1. Vérifier l'état initial
-    print("1. État initial...")
     try:
-        response = requests.get(f"{API_BASE_URL}/verify")
+        response = SESSION.get(f"{API_BASE_URL}/merkle")
         if response.status_code == 200:
-            data = response.json()
+            return response.json()["root"]
+    except requests.exceptions.ConnectionError:
+        pass
+    return None
+
+
+def _merkle_root_check(root_before, txs):
+    """
+    Racine recalculée localement sur le fichier modifié, comparée à celle du registre intact.
+    Paramètres:
+        root_before: Racine du registre intact (voir _merkle_root_ref)
+        txs: Liste des transactions après l'attaque
+    Retourne: True si la suppression est détectée (ou si la racine est indisponible)
+    """
+    if root_before is None:
+        print("\n   ⚠️  Racine de Merkle indisponible (GET /merkle)")
+        return True
+    merkle_detected = merkle_root(merkle_leaves(txs)).hex() != root_before
+    print(f"\n   Racine de Merkle : "
+          f"{'✅ différente de celle du registre intact, modification détectée' if merkle_detected else '❌ identique'}")
+    return merkle_detected
+
+
+# Table des attaques testées, dans l'ordre d'exécution
+ATTACKS = [
+    {
+        "name": "Modification de montant",
+        "title": "Attaque de modification de montant",
+        "action": "Modification du montant",
+        "mutate": _mutate_amount,
+        "detected": ["La chaîne de hash est cassée"],
+        "show_target_reason": True,
+        "target_reason": None,  # Raison attendue pour la cible (None : non contrôlée)
+        "merkle": "proof",  # Preuve d'appartenance de la cible (voir _merkle_proof_ref)
+    },
+    {
+        "name": "Suppression",
+        "title": "Attaque de suppression",
+        "action": "Suppression de la transaction",
+        "mutate": _mutate_delete,
+        "detected": ["La chaîne de hash est cassée (les transactions suivantes",
+                     "dépendent du hash de la transaction supprimée)"],
+        "show_target_reason": False,
+        "target_reason": None,
+        "merkle": "root",  # Racine de tout le registre (voir _merkle_root_ref)
+    },
+    {
+        "name": "Hash non textuel",
+        "title": "Attaque sur le hash stocké (nombre)",
+        "action": "Remplacement du hash stocké",
+        "mutate": _mutate_hash_number,
+        "detected": ["Le hash stocké ne correspond plus au hash recalculé"],
+        "show_target_reason": True,
+        "target_reason": "Hash invalide",
+        "merkle": "root",  # La preuve recalcule le hash de la cible : seule la racine voit le hash stocké
+    },
+    {
+        "name": "Hash nul",
+        "title": "Attaque sur le hash stocké (null)",
+        "action": "Mise à null du hash stocké",
+        "mutate": _mutate_hash_null,
+        "detected": ["Un hash nul échoue au contrôle du hash (ce n'est pas une transaction v1 sans hash)"],
+        "show_target_reason": True,
+        "target_reason": "Hash invalide",
+        "merkle": "root",
+    },
+]
+
+
+def _pick_target(txs):
+    """
+    Choisit la transaction attaquée : la deuxième dans l'ordre chronologique (pas la première,
+    pas la dernière). Le tri est fait une seule fois, sur l'état initial, pour tous les tests.
+    Paramètre: txs - Transactions de l'état initial
+    Retourne: Tuple (id de la cible, hash stocké de la transaction précédente), ou None si aucune cible valide
+    """
+    if len(txs) < 2:
+        print("⚠️  Il faut au moins 2 transactions pour tester\n")
+        return None
+    sorted_txs = sorted(txs, key=lambda tx: tx.get("t", ""))
+    target_tx = sorted_txs[1]  # Deuxième transaction
+    if "h" not in target_tx:
+        print("⚠️  Transaction cible invalide\n")
+        return None
+    return target_tx["id"], sorted_txs[0].get("h", "0")
+
+
+def _check_initial_state():
+    """
+    Vérifie (et affiche) l'état initial avant une attaque.
+    Retourne: True si /verify répond OK
+    """
+    print("1. État initial...")
+    try:
+        status_code, data = _verify()
+        if status_code == 200:
             print(f"   Status: {data['status']}")
+            print(f"   Transactions valides: {data['valid_count']}/{data['total_transactions']}")
             if data['status'] != 'OK':
                 print("   ⚠️  Le système n'est pas dans un état valide initialement")
                 return False
         else:
-            print(f"   ❌ Erreur API: {response.status_code}")
+            print(f"   ❌ Erreur API: {status_code}")
             return False
     except requests.exceptions.ConnectionError:
         print("   ❌ Impossible de se connecter à l'API.")
+        print("   Assurez-vous que le serveur Flask est démarré (python app.py)")
         return False
+    return True
+
+
+def _run_attack(number, attack, target_id, prev_hash):
+    """
+    Exécute une attaque de la table ATTACKS et vérifie qu'elle est détectée (v3).
+    Paramètres:
+        number: Numéro du test (affichage)
+        attack: Entrée de ATTACKS
+        target_id: Id de la transaction attaquée (voir _pick_target)
+        prev_hash: Hash stocké de la transaction qui la précède dans la chaîne
+    Retourne: True si l'attaque est détectée par /verify et par l'arbre de Merkle
+    """
+    print(f"=== TEST {number} : {attack['title']} (v3) ===\n")
+    
+    # Le registre n'est pas encore modifié : la référence de Merkle (requête HTTP) et la lecture de
+    # tx.json sont lancées en parallèle de la vérification de l'état initial (autre requête HTTP).
+    # Les deux attaques, elles, restent successives : elles modifient le même tx.json, lu par le seul serveur.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        if attack["merkle"] == "proof":
+            merkle_future = pool.submit(_merkle_proof_ref, target_id)
+        else:
+            merkle_future = pool.submit(_merkle_root_ref)
+        txs_future = pool.submit(lambda: orjson.loads(TX_FILE.read_bytes()))
+        if not _check_initial_state():
+            return False
+        merkle_ref = merkle_future.result()
+        txs = txs_future.result()
     
-    # 2. Lire les transactions
-    with open(TX_FILE, "r", encoding="utf-8") as f:
-        txs = json.load(f)
-    
-    if len(txs) < 2:
-        print("   ⚠️  Il faut au moins 2 transactions pour tester")
-        return False
-    
-    # Trier et trouver une transaction au milieu
-    sorted_txs = sorted(txs, key=lambda tx: tx.get("t", ""))
-    target_tx = sorted_txs[1] if len(sorted_txs) >= 2 else sorted_txs[0]
+    # 2. Retrouver la cible (choisie une fois dans main, sans nouveau tri)
+    target_tx = next((tx for tx in txs if tx.get("id") == target_id), None)
     
-    if "h" not in target_tx:
-        print("   ⚠️  Transaction cible invalide")
+    if target_tx is None:
+        print("   ⚠️  Transaction cible introuvable")
         return False
     
     print(f"   ✓ Transaction cible: ID {target_tx['id']}")
     print(f"      {target_tx['p1']} -> {target_tx['p2']}, montant = {target_tx['a']}")
     
-    # Sauvegarder pour restauration
-    saved_txs = txs.copy()
+    # 3. Attaque
+    print(f"\n2. ATTAQUE : {attack['action']}...")
+    txs = attack["mutate"](txs, target_tx)
     
-    # 3. Supprimer la transaction (attaque)
-    print(f"\n2. ATTAQUE : Suppression de la transaction...")
-    txs.remove(target_tx)
-    print(f"   Transaction ID {target_tx['id']} supprimée")
-    print(f"   Transactions restantes: {len(txs)}")
-    
-    with open(TX_FILE, "w", encoding="utf-8") as f:
-        json.dump(txs, f, indent=2, ensure_ascii=False)
+    _dump(txs)
     print("   ✓ Fichier modifié")
     
     # 4. Vérifier que l'attaque est détectée
     print("\n3. Vérification de l'intégrité...")
     try:
-        response = requests.get(f"{API_BASE_URL}/verify")
-        if response.status_code == 200:
-            data = response.json()
+        status_code, data = _verify()
+        if status_code == 200:
             print(f"   Status: {data['status']}")
             print(f"   Transactions invalides: {data['invalid_count']}")
             
             if data['status'] == 'KO' and data['invalid_count'] > 0:
                 print("\n   ✅ ATTAQUE DÉTECTÉE !")
-                print("   La chaîne de hash est cassée (les transactions suivantes")
-                print("   dépendent du hash de la transaction supprimée)")
+                for line in attack["detected"]:
+                    print(f"   {line}")
                 result = True
+                if attack["show_target_reason"]:
+                    hit = next((inv for inv in data['invalid_transactions'] if inv['id'] == target_id), None)
+                    if hit is not None:
+                        print(f"      Transaction ID {hit['id']}: {hit['reason']}")
+                    if attack["target_reason"] and (hit is None or attack["target_reason"] not in hit['reason']):
+                        print(f"\n   ❌ ERREUR : la cible n'est pas signalée comme « {attack['target_reason']} »")
+                        result = False
             else:
                 print("\n   ❌ ERREUR : L'attaque n'a pas été détectée !")
                 result = False
@@ -184,6 +348,13 @@ def test_deletion_attack():
     except:
         result = False
     
+    # Vérification par l'arbre de Merkle
+    if attack["merkle"] == "proof":
+        merkle_detected = _merkle_proof_check(merkle_ref, target_tx, prev_hash)
+    else:
+        merkle_detected = _merkle_root_check(merkle_ref, txs)
+    result = merkle_detected and result
+    
     # 5. Note: La restauration sera effectuée dans main()
     print("\n4. Note: La restauration sera effectuée après tous les tests\n")
     
@@ -193,17 +364,10 @@ def test_deletion_attack():
 def save_initial_state():
     """
     Sauvegarde l'état initial du fichier de transactions.
+    Retourne: Contenu exact du fichier (bytes) : aucune liste de transactions n'est gardée en mémoire
+    pendant les tests, et la restauration (voir _atomic.restoring) n'a rien à ré-encoder
     """
-    with open(TX_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def restore_state(state):
-    """
-    Restaure l'état du fichier de transactions.
-    """
-    with open(TX_FILE, "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2, ensure_ascii=False)
+    return TX_FILE.read_bytes()
 
 
 def verify_state():
@@ -211,15 +375,31 @@ def verify_state():
     Vérifie que l'état actuel est valide.
     """
     try:
-        response = requests.get(f"{API_BASE_URL}/verify")
-        if response.status_code == 200:
-            data = response.json()
+        status_code, data = _verify()
+        if status_code == 200:
             return data['status'] == 'OK'
     except:
         pass
     return False
 
 
+def wait_valid(timeout=0.5, step=0.01):
+    """
+    Attend que l'état soit valide en interrogeant /verify à intervalles courts, au lieu d'un délai fixe.
+    Paramètres:
+        timeout: Durée maximale d'attente en secondes
+        step: Intervalle entre deux vérifications en secondes
+    Retourne: True dès que /verify répond OK, False si le délai est écoulé
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        if verify_state():
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(step)
+
+
 def main():
     """
     Exécute tous les tests.
@@ -232,39 +412,41 @@ def main():
     # Sauvegarder l'état initial
     print("Sauvegarde de l'état initial...")
     initial_state = save_initial_state()
-    print(f"✓ {len(initial_state)} transaction(s) sauvegardée(s)\n")
-    
-    # Test 1
-    result1 = test_modification_attack()
-    
-    # Restaurer l'état initial avant le test 2
-    print("Restauration de l'état initial avant le test 2...")
-    restore_state(initial_state)
-    
-    # Vérifier que l'état est valide
-    import time
-    time.sleep(0.5)  # Petit délai pour s'assurer que le fichier est bien écrit
-    if verify_state():
-        print("✓ État restauré et valide\n")
-    else:
-        print("⚠️  L'état restauré n'est pas valide, mais on continue quand même\n")
-    
-    # Test 2
-    result2 = test_deletion_attack()
-    
-    # Restaurer l'état initial final
-    print("Restauration finale de l'état initial...")
-    restore_state(initial_state)
-    print("✓ État initial restauré\n")
+    # Décodage unique de l'état initial : compte et choix de la cible commune à tous les tests
+    # (l'état est restauré entre deux tests), la liste est ensuite libérée
+    txs = orjson.loads(initial_state)
+    print(f"✓ {len(txs)} transaction(s) sauvegardée(s)\n")
+    target = _pick_target(txs)
+    del txs
+    
+    results = []
+    for number, attack in enumerate(ATTACKS, 1):
+        if target is None:
+            results.append(False)
+            continue
+        # L'état initial est réécrit à la sortie du bloc, même si le test lève une exception
+        with restoring(TX_FILE, initial_state):
+            results.append(_run_attack(number, attack, *target))
+        
+        if number < len(ATTACKS):
+            print(f"Restauration de l'état initial avant le test {number + 1}...")
+            # Vérifier que l'état est valide (le fichier est écrit de façon synchrone : pas de délai fixe)
+            if wait_valid():
+                print("✓ État restauré et valide\n")
+            else:
+                print("⚠️  L'état restauré n'est pas valide, mais on continue quand même\n")
+        else:
+            print("Restauration finale de l'état initial...")
+            print("✓ État initial restauré\n")
     
     print("=" * 60)
     print("RÉSUMÉ")
     print("=" * 60)
-    print(f"Test 1 - Modification de montant: {'✅ RÉUSSI' if result1 else '❌ ÉCHOUÉ'}")
-    print(f"Test 2 - Suppression: {'✅ RÉUSSI' if result2 else '❌ ÉCHOUÉ'}")
+    for number, (attack, result) in enumerate(zip(ATTACKS, results), 1):
+        print(f"Test {number} - {attack['name']}: {'✅ RÉUSSI' if result else '❌ ÉCHOUÉ'}")
     print()
     
-    if result1 and result2:
+    if all(results):
         print("✅ Toutes les attaques sont maintenant détectées avec le hash chaîné (v3)")
     else:
         print("⚠️  Certaines attaques ne sont pas détectées correctement")
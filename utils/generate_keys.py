@@ -1,42 +1,50 @@
 """
-Script utilitaire pour générer des paires de clés RSA pour Tchaï v4.
+Script utilitaire pour générer des paires de clés pour Tchaï v4.
 
 Usage:
-    python utils/generate_keys.py <personne>
+    python utils/generate_keys.py <personne> [--rsa]
     
 Cela génère une paire de clés (privée et publique) pour une personne.
+Les clés sont de type Ed25519 (génération et signature bien plus rapides que RSA, clés de 32 octets) ;
+l'option --rsa génère une ancienne clé RSA-2048 (toujours acceptée par le serveur).
 La clé privée est sauvegardée localement (à garder secrète).
 La clé publique doit être enregistrée dans le système via POST /keys/<personne>
 """
 
 # Import des modules standards Python
+import os  # Module pour créer le fichier de clé privée avec des droits restreints
 import sys  # Module pour accéder aux arguments de la ligne de commande (sys.argv)
 from pathlib import Path  # Module pour manipuler les chemins de fichiers de manière portable
 
-# Import des modules de cryptographie pour générer des clés RSA
-from cryptography.hazmat.primitives.asymmetric import rsa  # Module pour générer des clés RSA
+# Import des modules de cryptographie pour générer des clés Ed25519 (ou RSA avec --rsa)
+from cryptography.hazmat.primitives.asymmetric import ed25519  # Module pour générer des clés Ed25519
+from cryptography.hazmat.primitives.asymmetric import rsa  # Module pour générer des clés RSA (--rsa)
 from cryptography.hazmat.primitives import serialization  # Module pour sérialiser les clés au format PEM
-from cryptography.hazmat.backends import default_backend  # Backend cryptographique par défaut
 
 # ===== CONFIGURATION =====
 KEYS_DIR = Path("keys")  # Dossier où seront stockées les clés privées (à garder secrètes)
 
 
-def generate_key_pair(person: str):
+def generate_key_pair(person: str, use_rsa: bool = False):
     """
-    Génère une paire de clés RSA pour une personne (v4).
-    Paramètre: person - Nom de la personne pour qui générer les clés
+    Génère une paire de clés pour une personne (v4).
+    Paramètres:
+        person: Nom de la personne pour qui générer les clés
+        use_rsa: True pour une clé RSA-2048 au lieu d'Ed25519
     """
     # Créer le dossier keys s'il n'existe pas (exist_ok=True évite l'erreur si déjà présent)
     KEYS_DIR.mkdir(exist_ok=True)
     
-    # ===== GÉNÉRATION DE LA PAIRE DE CLÉS RSA =====
-    # Génère une clé privée RSA avec les paramètres standards de sécurité
-    private_key = rsa.generate_private_key(
-        public_exponent=65537,  # Exposant public standard (nombre premier de Fermat, rapide et sécurisé)
-        key_size=2048,  # Taille de la clé en bits (2048 bits = niveau de sécurité recommandé)
-        backend=default_backend()  # Backend cryptographique par défaut
-    )
+    # ===== GÉNÉRATION DE LA PAIRE DE CLÉS =====
+    if use_rsa:
+        # Génère une clé privée RSA avec les paramètres standards de sécurité
+        private_key = rsa.generate_private_key(
+            public_exponent=65537,  # Exposant public standard (nombre premier de Fermat, rapide et sécurisé)
+            key_size=2048,  # Taille de la clé en bits (2048 bits = niveau de sécurité recommandé)
+        )  # Plus d'argument backend : cryptography >= 3.1 utilise toujours le backend OpenSSL
+    else:
+        # Clé Ed25519 : simple tirage aléatoire de 32 octets (pas de recherche de nombres premiers)
+        private_key = ed25519.Ed25519PrivateKey.generate()
     # Extrait la clé publique correspondante (dérivée de la clé privée)
     public_key = private_key.public_key()
     
@@ -50,9 +58,15 @@ def generate_key_pair(person: str):
     
     # Chemin du fichier de clé privée
     private_key_file = KEYS_DIR / f"{person}_private_key.pem"
-    # Sauvegarde la clé privée dans un fichier binaire
-    with open(private_key_file, "wb") as f:  # "wb" = write binary
-        f.write(private_key_pem)  # Écrit les bytes de la clé privée
+    # Sauvegarde la clé privée : fichier créé directement avec les droits 0o600 (lecture/écriture
+    # pour le propriétaire seulement), sans instant où la clé serait lisible par les autres utilisateurs
+    fd = os.open(private_key_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        if hasattr(os, "fchmod"):  # Absent sous Windows (droits gérés autrement)
+            os.fchmod(fd, 0o600)  # Fichier déjà existant (clé régénérée) : os.open ne change pas ses droits
+        os.write(fd, private_key_pem)  # Un seul appel d'écriture (la clé PEM fait moins de 2 Ko)
+    finally:
+        os.close(fd)
     print(f"✓ Clé privée sauvegardée : {private_key_file}")
     print("  ⚠️  GARDEZ CETTE CLÉ SECRÈTE !")  # Avertissement de sécurité
     
@@ -78,10 +92,11 @@ def generate_key_pair(person: str):
 if __name__ == "__main__":  # S'exécute seulement si le script est lancé directement
     # Vérifie que le nom de la personne est fourni en argument
     if len(sys.argv) < 2:  # sys.argv[0] = nom du script, sys.argv[1] = premier argument
-        print("Usage: python utils/generate_keys.py <personne>")
+        print("Usage: python utils/generate_keys.py <personne> [--rsa]")
         print("Exemple: python utils/generate_keys.py alice")
         sys.exit(1)  # Quitte avec code d'erreur 1
     
     person = sys.argv[1]  # Récupère le nom de la personne depuis les arguments
-    generate_key_pair(person)  # Génère la paire de clés pour cette personne
+    use_rsa = "--rsa" in sys.argv[2:]  # Ancienne clé RSA si demandée
+    generate_key_pair(person, use_rsa)  # Génère la paire de clés pour cette personne
 
@@ -3,48 +3,198 @@ Script utilitaire pour signer une transaction avec une clé privée.
 
 Usage:
     python utils/sign_transaction.py <personne> <p1> <p2> <montant> [timestamp]
+    python utils/sign_transaction.py --batch <personne> [transactions.jsonl]
     
-Cela génère la signature d'une transaction que vous pouvez utiliser dans POST /transactions
+Cela génère la signature d'une transaction que vous pouvez utiliser dans POST /transactions.
+En mode --batch, chaque ligne du fichier (ou de l'entrée standard) est une transaction JSON {"p1", "p2", "a", "t" (optionnel)} ;
+chaque ligne de sortie est le corps JSON signé, prêt pour POST /transactions.
 """
 
 # Import des modules standards Python
+import os  # Module pour connaître le nombre de processeurs (signature en parallèle)
 import sys  # Module pour accéder aux arguments de la ligne de commande
+import json  # Module pour lire/écrire les transactions du mode --batch (une par ligne)
 import base64  # Module pour encoder les signatures en base64 (pour transmission JSON/HTTP)
+from concurrent.futures import ProcessPoolExecutor  # Pool de processus pour signer les gros lots
+from functools import lru_cache  # Cache des clés privées déjà chargées
+from itertools import repeat  # Même personne passée à chaque partie du lot
 from pathlib import Path  # Module pour manipuler les chemins de fichiers
 from datetime import datetime, timezone  # Module pour générer des timestamps ISO8601
 
-# Import des modules de cryptographie pour signer avec RSA
+# Import des modules de cryptographie pour signer (Ed25519 par défaut, RSA pour les anciennes clés)
 from cryptography.hazmat.primitives import hashes, serialization  # hashes: SHA-256, serialization: format PEM
 from cryptography.hazmat.primitives.asymmetric import padding  # padding: PSS pour signatures RSA
-from cryptography.hazmat.backends import default_backend  # Backend cryptographique par défaut
+from cryptography.hazmat.primitives.asymmetric import ed25519  # ed25519: signatures Ed25519 (plus rapides, 64 octets)
 
 # ===== CONFIGURATION =====
 KEYS_DIR = Path("keys")  # Dossier où sont stockées les clés privées
 
+# Nombre minimal de transactions pour signer un lot sur plusieurs processus
+# (en dessous, lancer les processus (~10 ms) coûte plus cher que les signatures : ~40 µs par signature Ed25519)
+SIGN_POOL_MIN = 512
+
+# Paramètres RSA-PSS (SHA-256, sel de longueur maximale), créés une seule fois et réutilisés à chaque signature
+PSS_HASH = hashes.SHA256()  # Algorithme de hachage SHA-256
+PSS_PADDING = padding.PSS(  # Padding PSS (Probabilistic Signature Scheme) pour RSA
+    mgf=padding.MGF1(PSS_HASH),  # Fonction de génération de masque utilisant SHA-256
+    salt_length=padding.PSS.MAX_LENGTH  # Longueur maximale du sel pour sécurité maximale
+)
+
 
 def load_private_key(person: str):
     """
     Charge la clé privée d'une personne depuis le fichier.
+    Le fichier n'est relu et décodé que s'il a changé depuis le dernier chargement (cache par date de modification).
     Paramètre: person - Nom de la personne
-    Retourne: Objet clé privée RSA
+    Retourne: Objet clé privée (Ed25519 ou RSA)
     """
     # Chemin du fichier de clé privée
     private_key_file = KEYS_DIR / f"{person}_private_key.pem"
-    # Vérifie que le fichier existe
-    if not private_key_file.exists():
+    # Vérifie que le fichier existe (et récupère sa date de modification en un seul appel système)
+    try:
+        mtime_ns = private_key_file.stat().st_mtime_ns
+    except FileNotFoundError:
         raise FileNotFoundError(f"Clé privée non trouvée pour {person}. Générez-la d'abord avec generate_keys.py")
-    
-    # Ouvre le fichier en mode binaire et charge la clé privée
-    with open(private_key_file, "rb") as f:  # "rb" = read binary
-        # Charge la clé privée depuis le format PEM
-        private_key = serialization.load_pem_private_key(
-            f.read(),  # Lit tout le contenu du fichier (bytes)
-            password=None,  # Pas de mot de passe (clé non chiffrée)
-            backend=default_backend()  # Backend cryptographique
-        )
+    return _load_private_key_cached(person, mtime_ns)
+
+
+@lru_cache(maxsize=32)
+def _load_private_key_cached(person: str, mtime_ns: int):
+    """
+    Lit et décode la clé privée PEM d'une personne (opération coûteuse : décodage ASN.1 + grands entiers).
+    Le résultat est gardé en cache pour chaque (personne, date de modification) : une clé régénérée
+    (nouvelle date de modification) est donc relue automatiquement.
+    Paramètres:
+        person: Nom de la personne
+        mtime_ns: Date de modification du fichier en nanosecondes (clé du cache)
+    Retourne: Objet clé privée (Ed25519 ou RSA)
+    """
+    private_key_file = KEYS_DIR / f"{person}_private_key.pem"
+    # Charge la clé privée depuis le format PEM (fichier lu en une fois, en bytes)
+    private_key = serialization.load_pem_private_key(
+        private_key_file.read_bytes(),  # Tout le contenu du fichier (bytes)
+        password=None,  # Pas de mot de passe (clé non chiffrée)
+    )  # Plus d'argument backend : cryptography >= 3.1 utilise toujours le backend OpenSSL
     return private_key  # Retourne l'objet clé privée
 
 
+def signing_bytes(p1: str, p2: str, timestamp: str, amount) -> bytes:
+    """
+    Construit et encode une seule fois le message à signer (même format que signing_bytes dans app.py).
+    Le montant est formaté avec str() comme sur le serveur (100 reste "100", 100.0 reste "100.0").
+    Paramètres:
+        p1: Expéditeur
+        p2: Destinataire
+        timestamp: Timestamp ISO8601
+        amount: Montant
+    Retourne: Message "P1|P2|timestamp|montant" encodé en UTF-8
+    """
+    return f"{p1}|{p2}|{timestamp}|{amount}".encode('utf-8')
+
+
+def sign_message(private_key, message: bytes) -> str:
+    """
+    Signe un message avec une clé privée Ed25519, ou RSA (PSS + SHA-256) pour les anciennes clés.
+    Paramètres:
+        private_key: Clé privée (voir load_private_key)
+        message: Message à signer, déjà encodé (voir signing_bytes)
+    Retourne: Signature encodée en base64 (pour transmission JSON/HTTP)
+    """
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        # ===== SIGNATURE Ed25519 =====
+        # Ni padding ni fonction de hachage à préciser (SHA-512 intégré à l'algorithme)
+        signature = private_key.sign(message)
+        return base64.b64encode(signature).decode('utf-8')
+    
+    # ===== SIGNATURE RSA =====
+    # Signe le message avec la clé privée
+    signature = private_key.sign(
+        message,  # Message déjà encodé en UTF-8
+        PSS_PADDING,  # Padding PSS avec MGF1/SHA-256 (voir PSS_PADDING)
+        PSS_HASH  # Algorithme de hachage SHA-256
+    )
+    # ===== ENCODAGE BASE64 =====
+    # Encode la signature binaire en base64 pour transmission JSON/HTTP
+    return base64.b64encode(signature).decode('utf-8')
+
+
+def sign_transactions_batch(person: str, txs: list) -> list:
+    """
+    Signe une liste de transactions : la clé privée est chargée une seule fois, puis chaque message
+    est signé dans une boucle (l'API cryptography n'a pas de signature groupée).
+    Les gros lots (au moins SIGN_POOL_MIN) sont découpés en une partie par processeur, signées en parallèle.
+    Paramètres:
+        person: Personne qui signe (doit avoir une clé privée)
+        txs: Liste de tuples (p1, p2, montant, timestamp)
+    Retourne: Liste des signatures en base64, dans l'ordre de txs
+    """
+    private_key = load_private_key(person)  # Erreur immédiate si la clé n'existe pas
+    messages = [signing_bytes(p1, p2, timestamp, amount) for p1, p2, amount, timestamp in txs]
+    cpus = os.cpu_count() or 1
+    if len(messages) < SIGN_POOL_MIN or cpus < 2:
+        return _sign_chunk(person, messages)  # Clé déjà en cache : pas de nouvelle lecture du PEM
+    
+    size = -(-len(messages) // cpus)  # Division arrondie au supérieur
+    chunks = [messages[i:i + size] for i in range(0, len(messages), size)]
+    with ProcessPoolExecutor(max_workers=cpus) as pool:
+        return [signature for part in pool.map(_sign_chunk, repeat(person), chunks) for signature in part]
+
+
+def _sign_chunk(person: str, messages: list) -> list:
+    """
+    Signe une partie d'un lot dans un processus du pool (la clé n'est chargée qu'une fois par processus).
+    Paramètres:
+        person: Personne qui signe
+        messages: Messages déjà encodés (voir signing_bytes)
+    Retourne: Signatures en base64, dans l'ordre des messages
+    """
+    private_key = load_private_key(person)
+    return [sign_message(private_key, message) for message in messages]
+
+
+def sign_batch(person: str, lines) -> None:
+    """
+    Signe une série de transactions en un seul lancement du script et écrit chaque corps signé sur la
+    sortie standard (tamponnée) sans autre affichage. Les lignes sont lues par paquets signés avec
+    sign_transactions_batch (même chemin de signature, en parallèle pour les gros paquets) : la sortie
+    reste produite au fil de la lecture.
+    Paramètres:
+        person: Personne qui signe (doit avoir une clé privée)
+        lines: Lignes JSON {"p1", "p2", "a", "t" (optionnel, généré si absent)} (fichier ouvert ou sys.stdin)
+    """
+    load_private_key(person)  # Erreur immédiate si la clé n'existe pas (avant de lire l'entrée)
+    chunk_size = SIGN_POOL_MIN * (os.cpu_count() or 1)  # Un paquet = SIGN_POOL_MIN signatures par processeur
+    write = sys.stdout.write
+    chunk = []
+    for line in lines:
+        if not line.strip():  # Ignore les lignes vides
+            continue
+        tx = json.loads(line)
+        # Montant repris tel quel (100 reste 100) : le message doit être celui que le serveur recalculera
+        chunk.append((tx["p1"], tx["p2"], tx["a"], tx.get("t") or datetime.now(timezone.utc).isoformat()))
+        if len(chunk) >= chunk_size:
+            _write_signed(person, chunk, write)
+            chunk = []
+    if chunk:
+        _write_signed(person, chunk, write)
+
+
+def _write_signed(person: str, txs: list, write) -> None:
+    """
+    Signe un paquet de transactions et écrit un corps JSON signé par ligne (mode --batch).
+    Paramètres:
+        person: Personne qui signe
+        txs: Liste de tuples (p1, p2, montant, timestamp)
+        write: Fonction d'écriture (sys.stdout.write)
+    """
+    signatures = sign_transactions_batch(person, txs)
+    write("".join(
+        json.dumps({"p1": p1, "p2": p2, "a": amount, "t": timestamp, "signature": signature},
+                   ensure_ascii=False) + "\n"
+        for (p1, p2, amount, timestamp), signature in zip(txs, signatures)
+    ))
+
+
 def sign_transaction(person: str, p1: str, p2: str, amount: float, timestamp: str = None):
     """
     Signe une transaction avec la clé privée de la personne (v4).
@@ -61,48 +211,54 @@ def sign_transaction(person: str, p1: str, p2: str, amount: float, timestamp: st
     
     # ===== CRÉATION DU MESSAGE À SIGNER =====
     # Créer le message à signer (même format que dans app.py: "P1|P2|timestamp|montant")
-    message = f"{p1}|{p2}|{timestamp}|{amount}"  # Format identique à get_transaction_data_for_signing()
+    message = signing_bytes(p1, p2, timestamp, amount)  # Format identique à get_transaction_data_for_signing()
     
     # ===== CHARGEMENT DE LA CLÉ PRIVÉE =====
     # Charger la clé privée de la personne depuis le fichier
     private_key = load_private_key(person)
     
-    # ===== SIGNATURE RSA =====
-    # Signe le message avec la clé privée
-    signature = private_key.sign(
-        message.encode('utf-8'),  # Convertit le message en bytes UTF-8
-        padding.PSS(  # Padding PSS (Probabilistic Signature Scheme) pour RSA
-            mgf=padding.MGF1(hashes.SHA256()),  # Fonction de génération de masque utilisant SHA-256
-            salt_length=padding.PSS.MAX_LENGTH  # Longueur maximale du sel pour sécurité maximale
-        ),
-        hashes.SHA256()  # Algorithme de hachage SHA-256
-    )
-    
-    # ===== ENCODAGE BASE64 =====
-    # Encode la signature binaire en base64 pour transmission JSON/HTTP
-    signature_b64 = base64.b64encode(signature).decode('utf-8')
+    # ===== SIGNATURE + ENCODAGE BASE64 =====
+    signature_b64 = sign_message(private_key, message)
     
     # ===== AFFICHAGE DES RÉSULTATS =====
-    print(f"✓ Transaction signée par {person}")
-    print(f"\nMessage signé: {message}")  # Affiche le message original
-    print(f"\nSignature (base64):")
-    print(signature_b64)  # Affiche la signature encodée
-    # Instructions pour utiliser la signature dans l'API
-    print(f"\n📋 Utilisez cette signature dans POST /transactions:")
-    print(f"   {{")
-    print(f"     \"p1\": \"{p1}\",")
-    print(f"     \"p2\": \"{p2}\",")
-    print(f"     \"a\": {amount},")
-    print(f"     \"t\": \"{timestamp}\",")
-    print(f"     \"signature\": \"{signature_b64}\"")
-    print(f"   }}")
+    # Toutes les lignes sont assemblées puis écrites en un seul appel
+    lines = [
+        f"✓ Transaction signée par {person}",
+        f"\nMessage signé: {message.decode('utf-8')}",  # Affiche le message original
+        f"\nSignature (base64):",
+        signature_b64,  # Affiche la signature encodée
+        # Instructions pour utiliser la signature dans l'API
+        f"\n📋 Utilisez cette signature dans POST /transactions:",
+        f"   {{",
+        f"     \"p1\": \"{p1}\",",
+        f"     \"p2\": \"{p2}\",",
+        f"     \"a\": {amount},",
+        f"     \"t\": \"{timestamp}\",",
+        f"     \"signature\": \"{signature_b64}\"",
+        f"   }}",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # ===== POINT D'ENTRÉE PRINCIPAL =====
 if __name__ == "__main__":  # S'exécute seulement si le script est lancé directement
+    # Mode lot : transactions JSON lues dans un fichier (ou sur l'entrée standard), une par ligne
+    if len(sys.argv) in (3, 4) and sys.argv[1] == "--batch":
+        try:
+            if len(sys.argv) == 4:
+                with open(sys.argv[3], "r", encoding="utf-8") as f:
+                    sign_batch(sys.argv[2], f)
+            else:
+                sign_batch(sys.argv[2], sys.stdin)
+        except FileNotFoundError as e:  # Si la clé privée (ou le fichier de transactions) n'existe pas
+            print(f"❌ Erreur: {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+    
     # Vérifie que les arguments minimaux sont fournis
     if len(sys.argv) < 5:  # Besoin d'au moins: script, personne, p1, p2, montant
         print("Usage: python utils/sign_transaction.py <personne> <p1> <p2> <montant> [timestamp]")
+        print("       python utils/sign_transaction.py --batch <personne> [transactions.jsonl]")
         print("Exemple: python utils/sign_transaction.py alice alice bob 100")
         sys.exit(1)  # Quitte avec code d'erreur 1
     
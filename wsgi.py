@@ -0,0 +1,16 @@
+# Point d'entrée WSGI pour un serveur de production (gunicorn)
+# Exemple : gunicorn -c gunicorn.conf.py wsgi:app (voir gunicorn.conf.py)
+#
+# Avec --preload, ce module est importé une seule fois dans le processus maître, avant le fork
+# des workers : les transactions et les clés publiques déjà chargées sont partagées par tous les
+# workers (copie sur écriture). Chaque worker revérifie ensuite l'empreinte des fichiers à chaque
+# requête et relit ce qui a changé ; les ajouts restent sérialisés par le verrou sur tx.json.
+import logging
+
+from app import app, ensure_storage, check_sha256_backend, _warm_caches
+
+ensure_storage()  # Crée data/tx.json et data/keys.json s'ils n'existent pas
+# Sans mode debug, le journal de Flask est au niveau WARNING : le rapport SHA-256 (INFO) ne serait pas affiché
+app.logger.setLevel(logging.INFO)
+check_sha256_backend()  # Indique si SHA-256 profite de l'accélération matérielle
+_warm_caches()  # Remplit les caches avant le fork des workers